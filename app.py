@@ -1,14 +1,18 @@
 import streamlit as st
 import streamlit.components.v1 as components
-import pandas as pd
 import os
 
 from doomsday_engine import (
     parse_decklist,
-    suggest_viable_piles,
     generate_pile_details,
-    MANA_PRODUCE
+    refresh_config
 )
+from doomsday_engine.config import tables
+from doomsday_engine.results import suggest_table, display_frame, play_pattern_list
+
+# Pick up edits to config.json or decks/ on every rerun, without a restart
+refresh_config()
+MANA_PRODUCE = tables().mana_produce
 
 # ─── Page & Sidebar Setup ─────────────────────────────────────────────────────
 st.set_page_config(page_title="Vintage Doomsday Engine", layout="wide", page_icon="favicon.ico")
@@ -101,8 +105,8 @@ if generate:
     for src in starting:
         for clr, amt in MANA_PRODUCE[src].items():
             initial_pool[clr] = initial_pool.get(clr, 0) + amt
-    # Compute suggestions
-    suggestions = suggest_viable_piles(
+    # Compute suggestions as a columnar table (display strings are categorical)
+    df = display_frame(suggest_table(
         deck,
         constraints,
         od,
@@ -110,9 +114,7 @@ if generate:
         initial_pool,
         land_drops,
         top_n=50
-    )
-    df = pd.DataFrame(suggestions)
-    df["play_pattern_str"] = df["play_pattern"].apply(lambda x: " → ".join(x))
+    ))
     # Cache in session
     st.session_state.df = df
     st.session_state.selected_pile = None  # reset drill-down
@@ -127,12 +129,12 @@ if st.session_state.df is not None:
     selected = st.selectbox(
         "Choose a pile to inspect:",
         options=df.index.tolist(),
-        format_func=lambda i: df.at[i, "play_pattern_str"],
+        format_func=lambda i: df.at[i, "play_pattern"],
         key="selected_pile"
     )
 
     if st.session_state.selected_pile is not None:
-        play_list = df.at[st.session_state.selected_pile, "play_pattern"]
+        play_list = play_pattern_list(df.at[st.session_state.selected_pile, "play_pattern"])
         initial_hand = [c.strip() for c in initial_hand_input.split(",")] if initial_hand_input else []
         # Rebuild initial_pool for drill-down
         initial_pool = {}
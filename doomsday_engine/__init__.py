@@ -6,21 +6,76 @@ Modules:
 - parser
 - vulnerabilities
 - turns
+- simulation
 - suggester
+- multiturn
+- incremental
+- details
+- analytics
+- results
+- batch
+- fuzz
+
+The public names below are resolved lazily on first attribute access, so
+parsing or simulating never pays for pandas (details) or requests (Scryfall
+cache) unless those parts of the API are actually used.
 """
 
-from .parser import parse_decklist
-from .vulnerabilities import (
-    vulnerable_to_force, vulnerable_to_fluster, vulnerable_to_surgical,
-    vulnerable_to_mindbreak, vulnerable_to_dress_down,
-    vulnerable_to_consign, vulnerable_to_orcish, vulnerable_to_pyroblast
-)
-from .turns import turns_to_win
-from .suggester import suggest_viable_piles
-
-from .config import (
-    ORACLE, DRAW_SPELLS, MANA_SOURCES, TUTORS,
-    DRAW_COUNTS, PROTECTION_SPELLS, TURN_SPELLS,
-    MANA_PRODUCE, MANA_COSTS
-)
-from .details import generate_pile_details
\ No newline at end of file
+import importlib
+
+# public name -> submodule that defines it
+_LAZY = {
+    "parse_decklist": "parser",
+
+    "vulnerable_to_force": "vulnerabilities",
+    "vulnerable_to_fluster": "vulnerabilities",
+    "vulnerable_to_surgical": "vulnerabilities",
+    "vulnerable_to_mindbreak": "vulnerabilities",
+    "vulnerable_to_dress_down": "vulnerabilities",
+    "vulnerable_to_consign": "vulnerabilities",
+    "vulnerable_to_orcish": "vulnerabilities",
+    "vulnerable_to_pyroblast": "vulnerabilities",
+
+    "turns_to_win": "turns",
+    "simulate_pile": "simulation",
+    "simulate_detailed_pile": "simulation",
+    "suggest_viable_piles": "suggester",
+    "search_packed": "suggester",
+    "IncrementalSearch": "incremental",
+    "simulate_multiturn": "multiturn",
+    "rank_multiturn": "multiturn",
+
+    "ORACLE": "config",
+    "DRAW_SPELLS": "config",
+    "MANA_SOURCES": "config",
+    "TUTORS": "config",
+    "DRAW_COUNTS": "config",
+    "PROTECTION_SPELLS": "config",
+    "TURN_SPELLS": "config",
+    "MANA_PRODUCE": "config",
+    "MANA_COSTS": "config",
+    "refresh_config": "config",
+    "config_version": "config",
+
+    "generate_pile_details": "details",
+    "suggest_table": "results",
+    "card_contributions": "analytics",
+    "pair_synergies": "analytics",
+}
+
+__all__ = list(_LAZY)
+
+
+def __getattr__(name):
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    if module != "config":
+        # Config tables are replaced on reload, so they are looked up every time.
+        globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,165 @@
+"""
+analytics.py
+
+Per-card and per-pair contribution analytics over the full pile space.
+
+Every candidate pile is searched once per disruption profile (no top-N
+truncation) and packed into a pile x card 0/1 matrix plus a pile x profile
+win matrix; card and pair statistics are then matrix reductions. Pass one
+outcome_matrix result as `matrix=` to compute both without searching twice.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from .piles import CardIndex, mask_matrix
+from .suggester import search_packed
+
+# (card_names, piles, wins), as returned by outcome_matrix
+OutcomeMatrix = Tuple[List[str], np.ndarray, np.ndarray]
+
+
+def outcome_matrix(
+    deck: List[str],
+    constraints: Dict[str, Any],
+    profiles: Dict[str, Dict[str, bool]],
+    initial_hand: List[str] = None,
+    initial_pool: Dict[str, int] = None,
+    land_drops: int = 0
+) -> OutcomeMatrix:
+    """
+    Search every candidate pile against every profile.
+
+    Returns (card_names, piles, wins):
+      - piles: uint8 array (n_piles, n_cards), 1 where the pile holds the card
+      - wins:  uint8 array (n_piles, n_profiles), 1 where the pile wins
+    """
+    index = CardIndex(deck)
+
+    masks = None
+    columns = []
+    for disruption in profiles.values():
+        records = search_packed(
+            index, constraints, disruption, initial_hand, initial_pool, land_drops
+        ).records
+        if masks is None:
+            masks = [r.mask for r in records]
+        columns.append(np.fromiter((r.outcome == "win" for r in records), dtype=np.uint8, count=len(records)))
+
+    masks = masks or []
+    piles = mask_matrix(masks, len(index))
+    wins = np.stack(columns, axis=1) if columns else np.zeros((len(masks), 0), dtype=np.uint8)
+    return index.names, piles, wins
+
+
+def _rate(num: np.ndarray, den: np.ndarray) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(den > 0, num / np.maximum(den, 1), np.nan)
+
+
+def card_contributions(
+    deck: List[str],
+    constraints: Dict[str, Any],
+    profiles: Dict[str, Dict[str, bool]],
+    initial_hand: List[str] = None,
+    initial_pool: Dict[str, int] = None,
+    land_drops: int = 0,
+    matrix: Optional[OutcomeMatrix] = None
+) -> pd.DataFrame:
+    """
+    Per-card statistics for each disruption profile.
+
+    matrix: outcome_matrix(deck, constraints, profiles, ...) computed
+    beforehand; the search is then skipped.
+
+    Columns:
+      - profile, card
+      - piles: candidate piles containing the card
+      - wins: winning piles containing the card
+      - win_rate: wins / piles
+      - win_rate_without: win rate of piles without the card
+      - marginal: win_rate - win_rate_without
+      - share_of_wins: fraction of all winning piles that contain the card
+    """
+    if matrix is None:
+        matrix = outcome_matrix(deck, constraints, profiles, initial_hand, initial_pool, land_drops)
+    names, piles, wins = matrix
+    m = piles.astype(np.int64)
+    w = wins.astype(np.int64)
+
+    card_piles = m.sum(axis=0)[:, None]           # (cards, 1)
+    card_wins = m.T @ w                           # (cards, profiles)
+    total_piles = len(m)
+    total_wins = w.sum(axis=0)[None, :]           # (1, profiles)
+
+    win_rate = _rate(card_wins, card_piles)
+    without = _rate(total_wins - card_wins, total_piles - card_piles)
+
+    n_cards, n_profiles = card_wins.shape
+    return pd.DataFrame({
+        "profile": np.tile(np.array(list(profiles), dtype=object), n_cards),
+        "card": np.repeat(np.array(names, dtype=object), n_profiles),
+        "piles": np.repeat(card_piles[:, 0], n_profiles),
+        "wins": card_wins.ravel(),
+        "win_rate": win_rate.ravel(),
+        "win_rate_without": without.ravel(),
+        "marginal": (win_rate - without).ravel(),
+        "share_of_wins": _rate(card_wins, np.broadcast_to(total_wins, card_wins.shape)).ravel(),
+    })
+
+
+def pair_synergies(
+    deck: List[str],
+    constraints: Dict[str, Any],
+    profiles: Dict[str, Dict[str, bool]],
+    initial_hand: List[str] = None,
+    initial_pool: Dict[str, int] = None,
+    land_drops: int = 0,
+    top_k: int = 20,
+    matrix: Optional[OutcomeMatrix] = None
+) -> pd.DataFrame:
+    """
+    Top card pairs by winning co-occurrence, per disruption profile.
+
+    matrix: as for card_contributions.
+
+    Columns:
+      - profile, card_a, card_b
+      - piles: candidate piles containing both cards
+      - wins: winning piles containing both cards
+      - win_rate: wins / piles
+      - synergy: pair win rate minus what the two cards' individual win
+        rates predict additively (positive = better together)
+    """
+    if matrix is None:
+        matrix = outcome_matrix(deck, constraints, profiles, initial_hand, initial_pool, land_drops)
+    names, piles, wins = matrix
+    m = piles.astype(np.int64)
+    total_piles = len(m)
+    pair_piles = m.T @ m                          # (cards, cards)
+    card_piles = np.diag(pair_piles)
+    a, b = np.triu_indices(len(names), k=1)
+    keep = pair_piles[a, b] > 0
+    a, b = a[keep], b[keep]
+
+    frames = []
+    for p, profile in enumerate(profiles):
+        w = wins[:, p].astype(np.int64)
+        pair_wins = (m * w[:, None]).T @ m
+        card_rate = _rate(np.diag(pair_wins), card_piles)
+        overall = w.sum() / total_piles if total_piles else np.nan
+        rate = _rate(pair_wins[a, b], pair_piles[a, b])
+        df = pd.DataFrame({
+            "profile": profile,
+            "card_a": np.array(names, dtype=object)[a],
+            "card_b": np.array(names, dtype=object)[b],
+            "piles": pair_piles[a, b],
+            "wins": pair_wins[a, b],
+            "win_rate": rate,
+            "synergy": rate - card_rate[a] - card_rate[b] + overall,
+        })
+        frames.append(df.sort_values(["wins", "synergy"], ascending=False, kind="stable").head(top_k))
+
+    if not frames:
+        return pd.DataFrame(columns=["profile", "card_a", "card_b", "piles", "wins", "win_rate", "synergy"])
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,240 @@
+"""
+batch.py
+
+Command-line corpus analysis: evaluate every decklist in a directory against
+a set of named opponent disruption profiles.
+
+    python -m doomsday_engine.batch decks/ profiles.json -o results.csv -j 8
+
+Each (deck x profile) job searches the full pile space (as
+`suggest_viable_piles(top_n=None)` would, but only the best pile is decoded)
+and writes one summary row to a CSV file as soon as it finishes. Rerunning with
+the same output file skips jobs that already have a row, so an interrupted run
+can simply be restarted. Mana costs for every card in the corpus are looked up
+once, in the parent process, and handed to the workers. A job that raises
+does not stop the others: every finished row is written, and the failures
+are reported at the end (they have no row, so a rerun retries them).
+
+Profiles file format (JSON), either a bare disruption dict per profile:
+
+    {"fow_only": {"has_force_of_will": true}}
+
+or a structured entry with optional search parameters:
+
+    {"blue_mirror": {
+        "opponent_disruption": {"has_force_of_will": true, "has_flusterstorm": true},
+        "constraints": {"max_life_loss": 6},
+        "initial_hand": ["Brainstorm"],
+        "initial_pool": {"B": 1},
+        "land_drops": 1
+    }}
+"""
+
+import argparse
+import csv
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .parser import iter_decklists
+
+FIELDS = [
+    "deck", "profile", "candidates", "wins", "win_rate",
+    "best_outcome", "best_turns", "best_storm", "best_pile", "best_play_pattern",
+]
+
+
+class BatchFailed(Exception):
+    """Some jobs raised; every other job's row was written."""
+
+    def __init__(self, completed: int, failures: Dict[Tuple[str, str], BaseException]):
+        self.completed = completed
+        self.failures = failures
+        super().__init__(f"{len(failures)} job(s) failed, {completed} completed")
+
+
+def load_decks(deck_dir: Path) -> Dict[str, List[str]]:
+    """
+    Parse every decklist (.txt or .dek) under `deck_dir` once, keyed by its
+    path relative to `deck_dir` (suffix included, so x.txt and x.dek differ).
+    """
+    deck_dir = Path(deck_dir)
+    decks = {}
+    for path, counts in iter_decklists(deck_dir):
+        decks[path.relative_to(deck_dir).as_posix()] = sorted(counts)
+    return decks
+
+
+def load_profiles(path: Path) -> Dict[str, Dict[str, Any]]:
+    """Load profiles JSON and normalize every entry to the structured form."""
+    raw = json.loads(Path(path).read_text(encoding="utf-8"))
+    profiles = {}
+    for name, spec in raw.items():
+        if "opponent_disruption" not in spec:
+            spec = {"opponent_disruption": spec}
+        profiles[name] = {
+            "opponent_disruption": spec["opponent_disruption"],
+            "constraints": spec.get("constraints", {}),
+            "initial_hand": spec.get("initial_hand", []),
+            "initial_pool": spec.get("initial_pool", {}),
+            "land_drops": spec.get("land_drops", 0),
+        }
+    return profiles
+
+
+def completed_jobs(out_path: Path) -> Set[Tuple[str, str]]:
+    """(deck, profile) pairs that already have a row in `out_path`."""
+    if not out_path.exists():
+        return set()
+    with open(out_path, newline="", encoding="utf-8") as f:
+        return {(row["deck"], row["profile"]) for row in csv.DictReader(f)}
+
+
+def corpus_costs(decks: Dict[str, List[str]]) -> Dict[str, Dict[str, int]]:
+    """Mana costs for every card in `decks`; only cards config doesn't know are looked up."""
+    from .config import lookup_costs, tables
+    costs = tables().mana_costs
+    cards = set().union(*decks.values())
+    known = {card: costs[card] for card in cards if card in costs}
+    return {**known, **lookup_costs(cards - known.keys())}
+
+
+def run_job(deck_name: str, cards: List[str], profile_name: str, profile: Dict[str, Any]) -> Dict[str, Any]:
+    """Search one deck against one profile and summarize the result as a CSV row."""
+    from .suggester import search_packed
+
+    # Count on packed records; only the best pile is decoded.
+    search = search_packed(
+        cards,
+        profile["constraints"],
+        profile["opponent_disruption"],
+        profile["initial_hand"],
+        profile["initial_pool"],
+        profile["land_drops"]
+    )
+    records = search.records
+    wins = sum(1 for r in records if r.outcome == "win")
+    row: Dict[str, Any] = {
+        "deck": deck_name,
+        "profile": profile_name,
+        "candidates": len(records),
+        "wins": wins,
+        "win_rate": round(wins / len(records), 4) if records else 0.0,
+        "best_outcome": "",
+        "best_turns": "",
+        "best_storm": "",
+        "best_pile": "",
+        "best_play_pattern": "",
+    }
+    if records:
+        best = search.decode(search.best())
+        row.update({
+            "best_outcome": best["outcome"],
+            "best_turns": best["turns_to_win"],
+            "best_storm": best["storm_count"],
+            "best_pile": "; ".join(best["pile"]),
+            "best_play_pattern": " → ".join(best["play_pattern"]),
+        })
+    return row
+
+
+def _init_worker(costs: Dict[str, Dict[str, int]]) -> None:
+    # Load config (card tables and mana costs) once per worker process and
+    # add the corpus costs the parent looked up, so every job on that worker
+    # reuses them and no worker fetches on its own.
+    from .config import add_mana_costs
+    from . import suggester  # noqa: F401
+    add_mana_costs(costs)
+
+
+def run_batch(
+    deck_dir: Path,
+    profiles_path: Path,
+    out_path: Path,
+    workers: Optional[int] = None
+) -> int:
+    """
+    Run every pending (deck x profile) job and append rows to `out_path`.
+    Returns the number of jobs run; raises BatchFailed (after writing every
+    finished row) if any job raised.
+    """
+    out_path = Path(out_path)
+    decks = load_decks(deck_dir)
+    profiles = load_profiles(profiles_path)
+    done = completed_jobs(out_path)
+    jobs = [
+        (deck_name, profile_name)
+        for deck_name in decks
+        for profile_name in profiles
+        if (deck_name, profile_name) not in done
+    ]
+    if not jobs:
+        return 0
+    costs = corpus_costs({deck_name: decks[deck_name] for deck_name, _ in jobs})
+
+    new_file = not out_path.exists() or out_path.stat().st_size == 0
+    with open(out_path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        if new_file:
+            writer.writeheader()
+
+        def write(row: Dict[str, Any]) -> None:
+            writer.writerow(row)
+            f.flush()
+
+        failures: Dict[Tuple[str, str], BaseException] = {}
+        if workers == 1:
+            _init_worker(costs)
+            for deck_name, profile_name in jobs:
+                try:
+                    row = run_job(deck_name, decks[deck_name], profile_name, profiles[profile_name])
+                except Exception as e:
+                    failures[deck_name, profile_name] = e
+                    continue
+                write(row)
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(costs,)) as pool:
+                futures = {
+                    pool.submit(run_job, deck_name, decks[deck_name], profile_name, profiles[profile_name]):
+                        (deck_name, profile_name)
+                    for deck_name, profile_name in jobs
+                }
+                for future in as_completed(futures):
+                    try:
+                        row = future.result()
+                    except Exception as e:
+                        failures[futures[future]] = e
+                        continue
+                    write(row)
+    if failures:
+        raise BatchFailed(len(jobs) - len(failures), failures)
+    return len(jobs)
+
+
+def main(argv: Iterable[str] = None) -> None:
+    ap = argparse.ArgumentParser(
+        prog="python -m doomsday_engine.batch",
+        description="Evaluate every decklist in a directory against named disruption profiles."
+    )
+    ap.add_argument("deck_dir", type=Path, help="directory of .txt/.dek decklists (searched recursively)")
+    ap.add_argument("profiles", type=Path, help="JSON file of named opponent profiles")
+    ap.add_argument("-o", "--output", type=Path, default=Path("batch_results.csv"),
+                    help="CSV summary file (appended to; completed jobs are skipped)")
+    ap.add_argument("-j", "--workers", type=int, default=os.cpu_count(),
+                    help="worker processes (1 runs in-process)")
+    args = ap.parse_args(argv)
+
+    try:
+        n = run_batch(args.deck_dir, args.profiles, args.output, args.workers)
+    except BatchFailed as e:
+        for (deck_name, profile_name), error in sorted(e.failures.items()):
+            print(f"FAILED {deck_name} x {profile_name}: {error!r}")
+        print(f"ran {e.completed} job(s) -> {args.output}; {len(e.failures)} failed (rerun to retry)")
+        raise SystemExit(1)
+    print(f"ran {n} job(s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,48 +1,259 @@
 """
 Configuration module for Doomsday engine.
 Loads card lists, draw counts, mana production, and costs from config.json and decks directory.
+
+Every table lives in one immutable ConfigTables snapshot, read with tables().
+A ConfigRegistry fingerprints config.json and every deck file (.txt or .dek)
+by content; refresh() rebuilds only what changed (card lists when config.json
+changes; ALL_CARDS and costs for new cards when decks change), then publishes
+a new snapshot with a single assignment and bumps config_version(), which
+downstream caches key on. Reloads are serialized by a lock, and a search that
+takes one snapshot sees consistent tables however many reloads happen
+meanwhile. Costs an offline build could not look up are retried by every
+online refresh() until they are found.
+
+Nothing is loaded at import: the first tables() call (or the first table
+attribute access) builds the snapshot, so importing the package never
+touches decks/ or Scryfall by itself.
+
+The module-level names (ORACLE, DRAW_SPELLS, ..., MANA_COSTS) are kept for
+compatibility and resolve to the current snapshot on attribute access;
+`from .config import DRAW_SPELLS` binds the snapshot of that moment.
 """
 
+import hashlib
 import json
-import time
+import logging
+import threading
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict
-from .scryfall_cache import get_mana_cost
-from .parser import parse_decklist
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, Mapping, NamedTuple, Optional, Set, Tuple
+from .scryfall_cache import get_mana_cost, offline
+from .parser import deck_paths, iter_decklists
+
+log = logging.getLogger(__name__)
 
-# Load static config
 CONFIG_PATH = Path(__file__).parent / "config.json"
-with open(CONFIG_PATH) as f:
-    _cfg = json.load(f)
+DECKS_DIR = Path(__file__).parent.parent / "decks"
 
-ORACLE = _cfg["oracle"]
-DRAW_SPELLS = set(_cfg["draw_spells"])
-TUTORS = set(_cfg["tutors"])
-DRAW_COUNTS = _cfg["draw_counts"]
-PROTECTION_SPELLS = set(_cfg["protection_spells"])
-TURN_SPELLS = set(_cfg.get("turn_spells", []))
-MANA_PRODUCE = _cfg.get("mana_produce", {})
 
-# Derive MANA_SOURCES from the mana_produce mapping
-MANA_SOURCES = set(MANA_PRODUCE.keys())
+class ConfigTables(NamedTuple):
+    """One consistent, read-only view of every config table."""
+    oracle: str
+    draw_spells: FrozenSet[str]
+    tutors: FrozenSet[str]
+    draw_counts: Mapping[str, int]
+    protection_spells: FrozenSet[str]
+    turn_spells: FrozenSet[str]
+    mana_produce: Mapping[str, Mapping[str, int]]
+    # Derived from the mana_produce mapping
+    mana_sources: FrozenSet[str]
+    # Every card in decks/, and its Scryfall mana cost
+    all_cards: FrozenSet[str]
+    mana_costs: Mapping[str, Mapping[str, int]]
+    version: int = 0
 
-# Build ALL_CARDS from decks/ directory
-DECKS_DIR = Path(__file__).parent.parent / "decks"
-ALL_CARDS = set()
-for deck_file in DECKS_DIR.glob("*.txt"):
-    text = deck_file.read_text(encoding="utf-8")
-    cards = parse_decklist(text)
-    ALL_CARDS.update(cards)
 
-# Optionally include any additional cards
-# ALL_CARDS |= {"Doomsday", ORACLE, "Time Walk"}
+_EMPTY = ConfigTables(
+    "", frozenset(), frozenset(), MappingProxyType({}), frozenset(), frozenset(),
+    MappingProxyType({}), frozenset(), frozenset(), MappingProxyType({})
+)
+
+# Legacy module attribute -> ConfigTables field
+_TABLE_NAMES = {
+    "ORACLE": "oracle",
+    "DRAW_SPELLS": "draw_spells",
+    "TUTORS": "tutors",
+    "DRAW_COUNTS": "draw_counts",
+    "PROTECTION_SPELLS": "protection_spells",
+    "TURN_SPELLS": "turn_spells",
+    "MANA_PRODUCE": "mana_produce",
+    "MANA_SOURCES": "mana_sources",
+    "ALL_CARDS": "all_cards",
+    "MANA_COSTS": "mana_costs",
+}
+
+_TABLES: Optional[ConfigTables] = None
+
+
+def _frozen(mapping: Mapping) -> Mapping:
+    return MappingProxyType(dict(mapping))
+
+
+def lookup_costs(cards: Iterable[str]) -> Dict[str, Dict[str, int]]:
+    """Scryfall mana costs for `cards`; offline cache misses are left out."""
+    costs = {}
+    for card in sorted(cards):
+        try:
+            # cache hits are free; fetch_card_data throttles network requests
+            costs[card] = get_mana_cost(card)
+        except LookupError:
+            # offline cache miss: left out, so the first online refresh retries it
+            continue
+        except Exception:
+            costs[card] = {}
+    return costs
+
+
+class ConfigRegistry:
+    """Content-fingerprinted loader for config.json and the decks directory."""
+
+    def __init__(self, config_path: Path, decks_dir: Path):
+        self.config_path = Path(config_path)
+        self.decks_dir = Path(decks_dir)
+        # path -> ((mtime_ns, size), sha1); the stat pair avoids rehashing
+        self._fingerprints: Dict[Path, Tuple[Tuple[int, int], str]] = {}
+        self._config_hash: Optional[str] = None
+        self._deck_hashes: Dict[Path, Optional[str]] = {}
+        self._deck_cards: Dict[Path, Set[str]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def version(self) -> int:
+        return _TABLES.version if _TABLES is not None else 0
+
+    def _fingerprint(self, path: Path) -> Optional[str]:
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        key = (st.st_mtime_ns, st.st_size)
+        cached = self._fingerprints.get(path)
+        if cached and cached[0] == key:
+            return cached[1]
+        digest = hashlib.sha1(path.read_bytes()).hexdigest()
+        self._fingerprints[path] = (key, digest)
+        return digest
+
+    def _load_config(self, tables: ConfigTables) -> ConfigTables:
+        with open(self.config_path) as f:
+            cfg = json.load(f)
+        mana_produce = {card: _frozen(mana) for card, mana in cfg.get("mana_produce", {}).items()}
+        return tables._replace(
+            oracle=cfg["oracle"],
+            draw_spells=frozenset(cfg["draw_spells"]),
+            tutors=frozenset(cfg["tutors"]),
+            draw_counts=_frozen(cfg["draw_counts"]),
+            protection_spells=frozenset(cfg["protection_spells"]),
+            turn_spells=frozenset(cfg.get("turn_spells", [])),
+            mana_produce=_frozen(mana_produce),
+            mana_sources=frozenset(mana_produce),
+        )
+
+    def _refresh_decks(self) -> bool:
+        current = {
+            path: self._fingerprint(path)
+            for path in deck_paths(self.decks_dir)
+        }
+        changed = False
+        for path in set(self._deck_hashes) - set(current):
+            self._deck_cards.pop(path, None)
+            del self._deck_hashes[path]
+            self._fingerprints.pop(path, None)
+            changed = True
+        for path, digest in current.items():
+            if path in self._deck_hashes and self._deck_hashes[path] == digest:
+                continue
+            self._deck_hashes[path] = digest
+            changed = True
+            try:
+                _, counts = next(iter_decklists([path], include_sideboard=True))
+            except Exception as e:
+                # One unreadable deck must not take the whole package down;
+                # it is retried once its content changes.
+                log.warning("skipping unreadable decklist %s: %s", path, e)
+                self._deck_cards.pop(path, None)
+                continue
+            self._deck_cards[path] = set(counts)
+        return changed
 
-# Build mana cost lookup using flat-file Scryfall cache
-MANA_COSTS: Dict[str, Dict[str, int]] = {}
-for card in sorted(ALL_CARDS):
+    def _fetch_missing_costs(self, tables: ConfigTables) -> ConfigTables:
+        # Only cards not seen before are looked up; costs of cards that left
+        # the decks are kept, so re-adding them is free.
+        costs = lookup_costs(tables.all_cards - tables.mana_costs.keys())
+        return tables._replace(mana_costs=_frozen({**tables.mana_costs, **costs}))
+
+    def _publish(self, tables: ConfigTables) -> None:
+        global _TABLES
+        _TABLES = tables._replace(version=self.version + 1)
+
+    def add_costs(self, costs: Dict[str, Dict[str, int]]) -> bool:
+        """Merge externally looked-up costs into MANA_COSTS. Returns True if anything changed."""
+        with self._lock:
+            old = _TABLES or _EMPTY
+            merged = {**old.mana_costs, **costs}
+            if merged == old.mana_costs:
+                return False
+            self._publish(old._replace(mana_costs=_frozen(merged)))
+            return True
+
+    def refresh(self) -> bool:
+        """Reload whatever changed on disk. Returns True if anything did."""
+        with self._lock:
+            tables = _TABLES or _EMPTY
+            changed = False
+            digest = self._fingerprint(self.config_path)
+            if digest != self._config_hash:
+                tables = self._load_config(tables)
+                self._config_hash = digest
+                changed = True
+            if self._refresh_decks():
+                tables = tables._replace(all_cards=frozenset().union(*self._deck_cards.values()))
+                tables = self._fetch_missing_costs(tables)
+                changed = True
+            elif tables.all_cards - tables.mana_costs.keys() and not offline():
+                # Costs skipped while offline; look them up now that we can.
+                before = tables.mana_costs
+                tables = self._fetch_missing_costs(tables)
+                changed = changed or tables.mana_costs != before
+            if changed:
+                self._publish(tables)
+            return changed
+
+
+REGISTRY = ConfigRegistry(CONFIG_PATH, DECKS_DIR)
+
+
+def tables() -> ConfigTables:
+    """The current config snapshot. Take it once per search and read only from it."""
+    if _TABLES is None:
+        REGISTRY.refresh()
+    return _TABLES
+
+
+def refresh_config() -> bool:
+    """Pick up edits to config.json or decks/ without restarting."""
+    return REGISTRY.refresh()
+
+
+def add_mana_costs(costs: Dict[str, Dict[str, int]]) -> bool:
+    """Add costs for cards outside decks/ (e.g. a batch corpus); bumps config_version()."""
+    return REGISTRY.add_costs(costs)
+
+
+def config_version() -> int:
+    """Incremented on every effective reload; use it as a cache key."""
+    return REGISTRY.version
+
+
+@contextmanager
+def override_costs(costs: Dict[str, Dict[str, int]]):
+    """Run with MANA_COSTS replaced by `costs` (for tests and fuzzing), then restore it."""
+    global _TABLES
+    saved = tables()
+    _TABLES = saved._replace(mana_costs=_frozen(costs), version=saved.version + 1)
     try:
-        MANA_COSTS[card] = get_mana_cost(card)
-        # be polite to Scryfall
-        time.sleep(0.1)
-    except Exception:
-        MANA_COSTS[card] = {}
\ No newline at end of file
+        yield
+    finally:
+        _TABLES = saved._replace(version=_TABLES.version + 1)
+
+
+def __getattr__(name: str):
+    field = _TABLE_NAMES.get(name)
+    if field is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(tables(), field)
+
+# Optionally include any additional cards
+# ALL_CARDS |= {"Doomsday", ORACLE, "Time Walk"}
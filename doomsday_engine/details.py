@@ -38,10 +38,24 @@ def generate_pile_details(
     df = pd.DataFrame(steps)
 
     # Format pool dicts into strings for readability
-    df['pool_before'] = df['pool_before'].apply(
-        lambda d: ', '.join(f"{k}:{v}" for k, v in d.items())
-    )
-    df['pool_after'] = df['pool_after'].apply(
-        lambda d: ', '.join(f"{k}:{v}" for k, v in d.items())
-    )
-    return df
\ No newline at end of file
+    df['pool_before'] = _format_pools(df['pool_before'])
+    df['pool_after'] = _format_pools(df['pool_after'])
+    return df
+
+
+def _format_pools(pools: pd.Series) -> pd.Series:
+    """
+    "U:1, B:0, C:2" for each pool dict, with the colors in that dict's own
+    order (as results.format_pool does). Rows sharing an order are built
+    together, one color column at a time rather than one row at a time.
+    """
+    frame = pd.DataFrame(pools.tolist(), index=pools.index)
+    orders = pools.map(tuple)
+    out = pd.Series("", index=pools.index, dtype=object)
+    for colors, rows in orders.groupby(orders, sort=False).groups.items():
+        if not colors:
+            continue
+        part = frame.loc[rows]
+        items = [color + ":" + part[color].astype("Int64").astype(str) for color in colors]
+        out.loc[rows] = items[0].str.cat(items[1:], sep=", ")
+    return out
@@ -0,0 +1,624 @@
+"""
+fuzz.py
+
+Differential fuzzing of pile-search engines against the reference simulator.
+
+Random decks, constraints, pools, land drops, hands and disruption sets are
+drawn from the card universe in config.json and run, under a randomly
+generated mana-cost table (no Scryfall access), through every registered
+engine: suggest_viable_piles, IncrementalSearch, results.suggest_table,
+batch.run_job and analytics.outcome_matrix. Each must return what the
+reference enumeration built on `simulate_pile`, `simulate_detailed_pile` and
+`turns_to_win` returns (or, for the summarizing engines, that result reduced
+the same way), in summary and, where the engine has one, debug mode.
+
+Those three are also fuzzed directly on random play patterns (shuffled or
+mana-first orderings, with Force of Will, Time Walk, duplicates and missing
+Doomsday/Oracle): the two simulators must agree with each other, and each
+function must respect invariants that hold whatever the rules are (more mana,
+fewer hate cards or mana played earlier never change a playable result, cards
+behind the Oracle are never reached, ...). Mismatching cases are shrunk to a
+minimal counterexample.
+
+run_fuzz and run_pattern_fuzz serve Scryfall from the cache only
+(scryfall_cache.offline_mode) while they run; importing this module changes
+nothing.
+
+    python -m doomsday_engine.fuzz -n 500 --seed 1
+"""
+
+import argparse
+import itertools
+import random
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from . import config
+from .scryfall_cache import offline_mode
+from .simulation import HATE_CHECKS, simulate_pile, simulate_detailed_pile
+from .turns import turns_to_win
+
+
+class FuzzCase(NamedTuple):
+    deck: List[str]
+    constraints: Dict[str, Any]
+    opponent_disruption: Dict[str, bool]
+    initial_hand: List[str]
+    initial_pool: Dict[str, int]
+    land_drops: int
+    costs: Dict[str, Dict[str, int]]
+
+
+class Counterexample(NamedTuple):
+    engine: str
+    case: FuzzCase
+    debug: bool
+    expected: Any
+    actual: Any
+
+
+class Engine(NamedTuple):
+    """A fast path checked against reference_engine."""
+    run: Callable[[FuzzCase, bool], Any]
+    # Reduces the reference result to this engine's output (default: as is)
+    view: Optional[Callable[[List[Dict[str, Any]], bool], Any]] = None
+    # Engines without a debug mode are only checked in summary mode
+    debug: bool = True
+
+
+def card_universe() -> List[str]:
+    """Every card name config.json knows about, plus Doomsday itself."""
+    t = config.tables()
+    cards = {t.oracle, "Doomsday"}
+    cards |= t.draw_spells | t.tutors | t.protection_spells | t.turn_spells
+    cards |= set(t.draw_counts) | set(t.mana_produce)
+    return sorted(cards)
+
+
+# --- Case generation ---
+
+def _random_cost(rng: random.Random) -> Dict[str, int]:
+    cost = {}
+    for color, hi in (("U", 2), ("B", 3), ("C", 3)):
+        amt = rng.randint(0, hi) if rng.random() < 0.5 else 0
+        if amt:
+            cost[color] = amt
+    return cost
+
+
+def random_case(rng: random.Random, universe: List[str]) -> FuzzCase:
+    t = config.tables()
+    deck = rng.sample(universe, rng.randint(5, min(12, len(universe))))
+    if t.oracle not in deck and rng.random() < 0.8:
+        deck[0] = t.oracle
+    # Duplicates must not matter
+    deck += rng.sample(deck, rng.randint(0, 3))
+
+    constraints: Dict[str, Any] = {}
+    if rng.random() < 0.3:
+        constraints["must_include_oracle"] = rng.random() < 0.5
+    if rng.random() < 0.3:
+        constraints["must_include_draw"] = rng.random() < 0.5
+    if rng.random() < 0.5:
+        constraints["min_mana_sources"] = rng.randint(0, 3)
+    if rng.random() < 0.5:
+        constraints["max_life_loss"] = rng.choice([0, 2, 4, 20])
+
+    disruption = {key: rng.random() < 0.3 for key in HATE_CHECKS}
+    hand = rng.sample(universe, rng.randint(0, 2))
+    pool = {c: rng.randint(0, 3) for c in rng.sample(["U", "B", "C"], rng.randint(0, 3))}
+    land_drops = rng.randint(0, 2)
+    costs = {card: _random_cost(rng) for card in universe}
+    return FuzzCase(sorted(deck), constraints, disruption, hand, pool, land_drops, costs)
+
+
+# --- Engines ---
+
+def reference_engine(case: FuzzCase, debug: bool) -> List[Dict[str, Any]]:
+    """Straight enumeration with the reference simulators; the source of truth."""
+    t = config.tables()
+    unique_cards = sorted(set(case.deck))
+    constraints = case.constraints
+    entries = []
+    for pile in itertools.combinations(unique_cards, 5):
+        s = set(pile)
+        if constraints.get("must_include_oracle", True) and t.oracle not in s:
+            continue
+        if constraints.get("must_include_draw", True) and not (s & t.draw_spells):
+            continue
+        if len(s & set(t.mana_produce)) < constraints.get("min_mana_sources", 1):
+            continue
+        if len(s & {"Gitaxian Probe", "Street Wraith"}) * 2 > constraints.get("max_life_loss", 20):
+            continue
+
+        play_pattern = (
+            sorted(c for c in pile if c in t.mana_produce)
+            + sorted(c for c in pile if c in t.turn_spells)
+            + ["Doomsday"]
+            + sorted(c for c in pile if c in t.protection_spells)
+            + sorted(c for c in pile if c in t.draw_spells)
+            + [t.oracle]
+        )
+        entry = {
+            "pile": pile,
+            "play_pattern": play_pattern,
+            "turns_to_win": turns_to_win(tuple(play_pattern), case.initial_hand),
+        }
+        args = (play_pattern, case.opponent_disruption, case.initial_hand,
+                case.initial_pool, case.land_drops)
+        if debug:
+            last = simulate_detailed_pile(*args)[-1]
+            entry["outcome"] = last.get("outcome", "no_oracle")
+            entry["storm_count"] = last.get("storm_after", 0)
+            entry["leftover_pool"] = last.get("pool_after", {}).copy()
+            entry["failure_spell"] = last.get("card") if entry["outcome"] != "win" else None
+        else:
+            entry["outcome"], entry["storm_count"] = simulate_pile(*args)
+        entries.append(entry)
+
+    if not debug:
+        entries.sort(key=lambda x: (x["outcome"] != "win", x["turns_to_win"]))
+    return entries
+
+
+def _normalize(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [dict(e, pile=tuple(e["pile"]), play_pattern=list(e["play_pattern"])) for e in entries]
+
+
+def _packed_engine(case: FuzzCase, debug: bool) -> List[Dict[str, Any]]:
+    from .suggester import suggest_viable_piles
+    return _normalize(suggest_viable_piles(
+        case.deck, case.constraints, case.opponent_disruption,
+        case.initial_hand, case.initial_pool, case.land_drops,
+        top_n=None, debug=debug
+    ))
+
+
+def _incremental_engine(case: FuzzCase, debug: bool) -> List[Dict[str, Any]]:
+    # Start from a neighbouring deck (first card swapped for an outsider),
+    # then apply the delta to reach the case's deck.
+    from .incremental import IncrementalSearch
+    unique = sorted(set(case.deck))
+    outsider = next(c for c in card_universe() + ["Outsider"] if c not in unique)
+    search = IncrementalSearch(
+        case.constraints, case.opponent_disruption,
+        case.initial_hand, case.initial_pool, case.land_drops, debug=debug
+    )
+    search.update(unique[1:] + [outsider])
+    return _normalize(search.update(case.deck, top_n=None))
+
+
+def _table_engine(case: FuzzCase, debug: bool) -> List[Dict[str, Any]]:
+    # Back from columns to one dict per row
+    from .results import PILE_COLUMNS, play_pattern_list, suggest_table
+    table = suggest_table(
+        case.deck, case.constraints, case.opponent_disruption,
+        case.initial_hand, case.initial_pool, case.land_drops,
+        top_n=None, debug=debug
+    )
+    entries = []
+    for row in table.to_dict("records"):
+        entry = {
+            "pile": tuple(row[c] for c in PILE_COLUMNS),
+            "play_pattern": play_pattern_list(row["play_pattern"]),
+            "turns_to_win": int(row["turns_to_win"]),
+            "outcome": row["outcome"],
+            "storm_count": int(row["storm_count"]),
+        }
+        if debug:
+            entry["leftover_pool"] = row["leftover_pool"]
+            entry["failure_spell"] = row["failure_spell"] if isinstance(row["failure_spell"], str) else None
+        entries.append(entry)
+    return entries
+
+
+def _table_view(expected: List[Dict[str, Any]], debug: bool) -> List[Dict[str, Any]]:
+    from .results import format_pool
+    if not debug:
+        return expected
+    return [dict(e, leftover_pool=format_pool(e["leftover_pool"])) for e in expected]
+
+
+def _profile(case: FuzzCase) -> Dict[str, Any]:
+    return {
+        "opponent_disruption": case.opponent_disruption,
+        "constraints": case.constraints,
+        "initial_hand": case.initial_hand,
+        "initial_pool": case.initial_pool,
+        "land_drops": case.land_drops,
+    }
+
+
+def _batch_engine(case: FuzzCase, debug: bool) -> Dict[str, Any]:
+    from .batch import run_job
+    return run_job("case", sorted(set(case.deck)), "profile", _profile(case))
+
+
+def _batch_view(expected: List[Dict[str, Any]], debug: bool) -> Dict[str, Any]:
+    # The CSV row batch.run_job writes for this result
+    wins = sum(1 for e in expected if e["outcome"] == "win")
+    row: Dict[str, Any] = dict.fromkeys(
+        ["best_outcome", "best_turns", "best_storm", "best_pile", "best_play_pattern"], ""
+    )
+    row.update({
+        "deck": "case",
+        "profile": "profile",
+        "candidates": len(expected),
+        "wins": wins,
+        "win_rate": round(wins / len(expected), 4) if expected else 0.0,
+    })
+    if expected:
+        best = expected[0]
+        row.update({
+            "best_outcome": best["outcome"],
+            "best_turns": best["turns_to_win"],
+            "best_storm": best["storm_count"],
+            "best_pile": "; ".join(best["pile"]),
+            "best_play_pattern": " → ".join(best["play_pattern"]),
+        })
+    return row
+
+
+def _matrix_engine(case: FuzzCase, debug: bool) -> List[Tuple[Tuple[str, ...], bool]]:
+    from .analytics import outcome_matrix
+    names, piles, wins = outcome_matrix(
+        case.deck, case.constraints, {"profile": case.opponent_disruption},
+        case.initial_hand, case.initial_pool, case.land_drops
+    )
+    return sorted(
+        (tuple(name for name, bit in zip(names, row) if bit), bool(won[0]))
+        for row, won in zip(piles, wins)
+    )
+
+
+def _matrix_view(expected: List[Dict[str, Any]], debug: bool) -> List[Tuple[Tuple[str, ...], bool]]:
+    return sorted((e["pile"], e["outcome"] == "win") for e in expected)
+
+
+# Engines checked against reference_engine; add new fast paths here.
+ENGINES: Dict[str, Engine] = {
+    "packed": Engine(_packed_engine),
+    "incremental": Engine(_incremental_engine),
+    "table": Engine(_table_engine, _table_view),
+    "batch": Engine(_batch_engine, _batch_view, debug=False),
+    "outcome_matrix": Engine(_matrix_engine, _matrix_view, debug=False),
+}
+
+# Plain functions are taken as full-result engines with a debug mode.
+EngineLike = Union[Engine, Callable[[FuzzCase, bool], Any]]
+
+
+# --- Checking and shrinking ---
+
+def find_mismatches(
+    case: FuzzCase,
+    engines: Dict[str, EngineLike] = None
+) -> List[Counterexample]:
+    """Run `case` through every engine in both modes; return any disagreements."""
+    if engines is None:
+        engines = ENGINES
+    found = []
+    with config.override_costs(case.costs):
+        for debug in (False, True):
+            expected = reference_engine(case, debug)
+            for name, engine in engines.items():
+                if not isinstance(engine, Engine):
+                    engine = Engine(engine)
+                if debug and not engine.debug:
+                    continue
+                want = engine.view(expected, debug) if engine.view else expected
+                try:
+                    actual = engine.run(case, debug)
+                except Exception as e:  # a crash is a mismatch too
+                    actual = repr(e)
+                if actual != want:
+                    found.append(Counterexample(name, case, debug, want, actual))
+    return found
+
+
+def _shrink_candidates(case: FuzzCase) -> Iterable[FuzzCase]:
+    unique = sorted(set(case.deck))
+    if len(case.deck) != len(unique):
+        yield case._replace(deck=unique)
+    for card in unique:
+        if len(unique) > 5:
+            yield case._replace(deck=[c for c in unique if c != card])
+    for i in range(len(case.initial_hand)):
+        yield case._replace(initial_hand=case.initial_hand[:i] + case.initial_hand[i + 1:])
+    for key, on in case.opponent_disruption.items():
+        if on:
+            yield case._replace(opponent_disruption=dict(case.opponent_disruption, **{key: False}))
+    for key in case.constraints:
+        yield case._replace(constraints={k: v for k, v in case.constraints.items() if k != key})
+    if case.initial_pool:
+        yield case._replace(initial_pool={})
+    if case.land_drops:
+        yield case._replace(land_drops=0)
+    # Only the deck's cards need costs; then drop costs one card at a time.
+    relevant = {c: v for c, v in case.costs.items() if c in unique and v}
+    if relevant != case.costs:
+        yield case._replace(costs=relevant)
+    for card in relevant:
+        yield case._replace(costs={c: v for c, v in relevant.items() if c != card})
+
+
+def _shrink(case, candidates: Callable[[Any], Iterable[Any]], fails: Callable[[Any], bool]):
+    """Greedily replace `case` by the first smaller candidate that still fails."""
+    progress = True
+    while progress:
+        progress = False
+        for smaller in candidates(case):
+            if fails(smaller):
+                case = smaller
+                progress = True
+                break
+    return case
+
+
+def minimize(case: FuzzCase, engine: str, engines: Dict[str, EngineLike] = None) -> FuzzCase:
+    """Greedily shrink `case` while `engine` still disagrees with the reference."""
+    if engines is None:
+        engines = ENGINES
+    subset = {engine: engines[engine]}
+    return _shrink(case, _shrink_candidates, lambda c: bool(find_mismatches(c, subset)))
+
+
+def run_fuzz(
+    iterations: int = 200,
+    seed: Optional[int] = None,
+    engines: Dict[str, EngineLike] = None
+) -> List[Counterexample]:
+    """
+    Generate `iterations` random cases and return one minimized
+    counterexample per failing engine (empty list means all engines agree).
+    """
+    if engines is None:
+        engines = ENGINES
+    rng = random.Random(seed)
+    failures: Dict[str, Counterexample] = {}
+    with offline_mode():
+        universe = card_universe()
+        for _ in range(iterations):
+            pending = {n: e for n, e in engines.items() if n not in failures}
+            if not pending:
+                break
+            case = random_case(rng, universe)
+            for cx in find_mismatches(case, pending):
+                if cx.engine in failures:
+                    continue
+                small = minimize(case, cx.engine, engines)
+                failures[cx.engine] = find_mismatches(small, {cx.engine: engines[cx.engine]})[0]
+    return list(failures.values())
+
+
+# --- Play patterns ---
+
+class PatternCase(NamedTuple):
+    play_pattern: List[str]
+    opponent_disruption: Dict[str, bool]
+    initial_hand: List[str]
+    initial_pool: Dict[str, int]
+    land_drops: int
+    costs: Dict[str, Dict[str, int]]
+
+
+class PatternCounterexample(NamedTuple):
+    check: str
+    case: PatternCase
+    expected: Any
+    actual: Any
+
+
+# A check returns (expected, actual) for one case; they must compare equal.
+PatternCheck = Callable[[PatternCase], Tuple[Any, Any]]
+
+
+def random_pattern_case(rng: random.Random, universe: List[str]) -> PatternCase:
+    t = config.tables()
+    cards = rng.sample(universe, rng.randint(1, min(8, len(universe))))
+    for card, p in ((t.oracle, 0.8), ("Doomsday", 0.6), ("Force of Will", 0.5), ("Time Walk", 0.5)):
+        if card not in cards and rng.random() < p:
+            cards.append(card)
+    cards += rng.sample(cards, rng.randint(0, min(2, len(cards))))
+    rng.shuffle(cards)
+    if rng.random() < 0.5:
+        # Mana first, as a real sequencing would; order otherwise unchanged
+        cards.sort(key=lambda c: c not in t.mana_produce)
+
+    disruption = {key: rng.random() < 0.3 for key in HATE_CHECKS}
+    hand = rng.sample(universe, rng.randint(0, 2))
+    pool = {c: rng.randint(0, 3) for c in rng.sample(["U", "B", "C"], rng.randint(0, 3))}
+    costs = {card: _random_cost(rng) for card in universe}
+    return PatternCase(cards, disruption, hand, pool, rng.randint(0, 2), costs)
+
+
+def _simulate(case: PatternCase, **changes) -> Tuple[str, int]:
+    case = case._replace(**changes)
+    return simulate_pile(list(case.play_pattern), case.opponent_disruption, list(case.initial_hand),
+                         dict(case.initial_pool), case.land_drops, tables=config.tables())
+
+
+def _steps(case: PatternCase) -> List[Dict[str, Any]]:
+    return simulate_detailed_pile(list(case.play_pattern), case.opponent_disruption,
+                                  list(case.initial_hand), dict(case.initial_pool), case.land_drops)
+
+
+def _check_simulators_agree(case: PatternCase) -> Tuple[Any, Any]:
+    # The drill-down must end where the search simulator says the pile ends
+    last = _steps(case)[-1]
+    return _simulate(case), (last["outcome"] or "no_oracle", last["storm_after"])
+
+
+def _check_simulate_pile(case: PatternCase) -> Tuple[Any, Any]:
+    t = config.tables()
+    pattern = list(case.play_pattern)
+    base = _simulate(case)
+    playable = not base[0].startswith("insufficient_mana_for_")
+    more = {c: case.initial_pool.get(c, 0) + 1 for c in ("U", "B", "C")}
+    mana_first = sorted(pattern, key=lambda c: c not in t.mana_produce)
+    # Force of Will is cast for free, whatever its cost
+    free_force = t._replace(mana_costs={**t.mana_costs, "Force of Will": {"U": 9}})
+    actual = {
+        "more_mana": _simulate(case, initial_pool=more) == base if playable else True,
+        "mana_first": _simulate(case, play_pattern=mana_first) == base if playable else True,
+        # Switching off a hate card that did not stop the pile changes nothing
+        "fewer_hate": all(
+            _simulate(case, opponent_disruption=dict(case.opponent_disruption, **{key: False})) == base
+            for key, on in case.opponent_disruption.items() if on and key != base[0]
+        ),
+        "stops_at_oracle": (
+            _simulate(case, play_pattern=pattern + ["Force of Will", "Doomsday"]) == base
+            if t.oracle in pattern else True
+        ),
+        "free_force": simulate_pile(pattern, case.opponent_disruption, list(case.initial_hand),
+                                    dict(case.initial_pool), case.land_drops, tables=free_force) == base,
+    }
+    return dict.fromkeys(actual, True), actual
+
+
+def _check_simulate_detailed_pile(case: PatternCase) -> Tuple[Any, Any]:
+    steps = _steps(case)
+    pairs = list(zip(steps, steps[1:]))
+    actual = {
+        "numbered": [s["step"] for s in steps] == list(range(1, len(steps) + 1)),
+        # Each step starts from the pool and storm the previous one left
+        "continuous": all(
+            a["pool_after"] == b["pool_before"] and a["storm_after"] == b["storm_before"]
+            for a, b in pairs
+        ),
+        "mana_is_not_storm": all(
+            s["storm_after"] == s["storm_before"] for s in steps if s["type"] == "mana_production"
+        ),
+        # Only the last step may end the pile
+        "stops_at_outcome": not any(s["outcome"] for s, _ in pairs),
+        "first_hate_counters": all(
+            s["outcome"] == s["vulnerable_to"][0] for s in steps if s["vulnerable_to"]
+        ),
+    }
+    return dict.fromkeys(actual, True), actual
+
+
+def _check_turns_to_win(case: PatternCase) -> Tuple[Any, Any]:
+    t = config.tables()
+    pattern = tuple(case.play_pattern)
+    hand = list(case.initial_hand)
+    turns = turns_to_win(pattern, hand)
+    predrawn = sum(t.draw_counts.get(c, 1 if c in t.draw_spells else 0) for c in hand)
+    actual = {
+        "in_range": 0 <= turns <= len(pattern),
+        "hand_covers_pile": turns == 0 if predrawn >= len(pattern) else True,
+        # A Time Walk behind the Oracle is still credited as an extra turn
+        "time_walk_credit": (
+            turns_to_win(pattern + ("Time Walk",), hand) == max(0, turns - 1)
+            if t.oracle in pattern and predrawn < len(pattern) else True
+        ),
+    }
+    return dict.fromkeys(actual, True), actual
+
+
+# Direct checks of the single-pattern functions; add new ones here.
+PATTERN_CHECKS: Dict[str, PatternCheck] = {
+    "simulators_agree": _check_simulators_agree,
+    "simulate_pile": _check_simulate_pile,
+    "simulate_detailed_pile": _check_simulate_detailed_pile,
+    "turns_to_win": _check_turns_to_win,
+}
+
+
+def find_pattern_mismatches(
+    case: PatternCase,
+    checks: Dict[str, PatternCheck] = None
+) -> List[PatternCounterexample]:
+    """Run every check on `case`; return any that fail (or crash)."""
+    if checks is None:
+        checks = PATTERN_CHECKS
+    found = []
+    with config.override_costs(case.costs):
+        for name, check in checks.items():
+            try:
+                expected, actual = check(case)
+            except Exception as e:  # a crash is a mismatch too
+                expected, actual = None, repr(e)
+            if actual != expected or expected is None:
+                found.append(PatternCounterexample(name, case, expected, actual))
+    return found
+
+
+def _shrink_pattern_candidates(case: PatternCase) -> Iterable[PatternCase]:
+    pattern = case.play_pattern
+    for i in range(len(pattern)):
+        if len(pattern) > 1:
+            yield case._replace(play_pattern=pattern[:i] + pattern[i + 1:])
+    for i in range(len(case.initial_hand)):
+        yield case._replace(initial_hand=case.initial_hand[:i] + case.initial_hand[i + 1:])
+    for key, on in case.opponent_disruption.items():
+        if on:
+            yield case._replace(opponent_disruption=dict(case.opponent_disruption, **{key: False}))
+    if case.initial_pool:
+        yield case._replace(initial_pool={})
+    if case.land_drops:
+        yield case._replace(land_drops=0)
+    relevant = {c: v for c, v in case.costs.items() if c in pattern and v}
+    if relevant != case.costs:
+        yield case._replace(costs=relevant)
+    for card in relevant:
+        yield case._replace(costs={c: v for c, v in relevant.items() if c != card})
+
+
+def run_pattern_fuzz(
+    iterations: int = 200,
+    seed: Optional[int] = None,
+    checks: Dict[str, PatternCheck] = None
+) -> List[PatternCounterexample]:
+    """
+    Generate `iterations` random play patterns and return one minimized
+    counterexample per failing check (empty list means all checks hold).
+    """
+    if checks is None:
+        checks = PATTERN_CHECKS
+    rng = random.Random(seed)
+    failures: Dict[str, PatternCounterexample] = {}
+    with offline_mode():
+        universe = card_universe()
+        for _ in range(iterations):
+            pending = {n: c for n, c in checks.items() if n not in failures}
+            if not pending:
+                break
+            case = random_pattern_case(rng, universe)
+            for cx in find_pattern_mismatches(case, pending):
+                if cx.check in failures:
+                    continue
+                subset = {cx.check: checks[cx.check]}
+                small = _shrink(case, _shrink_pattern_candidates,
+                                lambda c: bool(find_pattern_mismatches(c, subset)))
+                failures[cx.check] = find_pattern_mismatches(small, subset)[0]
+    return list(failures.values())
+
+
+def main(argv: Iterable[str] = None) -> None:
+    ap = argparse.ArgumentParser(
+        prog="python -m doomsday_engine.fuzz",
+        description="Differentially fuzz pile-search engines and simulators against reference models."
+    )
+    ap.add_argument("-n", "--iterations", type=int, default=200)
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    failures = run_fuzz(args.iterations, args.seed)
+    pattern_failures = run_pattern_fuzz(args.iterations, args.seed)
+    if not failures and not pattern_failures:
+        print(f"{args.iterations} cases: all engines agree ({', '.join(ENGINES)}); "
+              f"all play-pattern checks hold ({', '.join(PATTERN_CHECKS)})")
+        return
+    for cx in failures:
+        print(f"MISMATCH in engine {cx.engine!r} (debug={cx.debug})")
+        for field, value in cx.case._asdict().items():
+            print(f"  {field}: {value}")
+    for cx in pattern_failures:
+        print(f"MISMATCH in {cx.check!r}: expected {cx.expected!r}, got {cx.actual!r}")
+        for field, value in cx.case._asdict().items():
+            print(f"  {field}: {value}")
+    raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""
+multiturn.py
+
+Multi-turn evaluation of a Doomsday pile against per-turn opponent interaction.
+
+`simulate_pile` resolves a play pattern in one uninterrupted sequence. Here the
+pile is a library that is drawn over several turns: each turn we untap (base
+mana and the Moxen and lands cast so far come back, storm resets), draw a card,
+and cast what we have drawn, in pile order. The opponent untaps too, and each hate card in `opponent_profile`
+is independently available with the given per-turn probability; an available
+hate card counters the first spell it applies to (per HATE_CHECKS) and is then
+spent for that turn. A countered spell loses the game. Time Walk grants a turn
+in which the opponent does not untap.
+
+At every point we choose between casting the next drawn card now or passing
+the turn (e.g. to keep storm low against Flusterstorm). The opponent's hand is
+hidden, so the choice may only depend on what we have seen: the DP runs over
+information states (pile position, cards drawn, turn, mana pool, storm,
+pending extra turns, and the set of opponent holdings still consistent with
+every spell that resolved since their last untap). Values are win
+probabilities weighted by that set, so cast-or-pass is decided once for all
+holdings we cannot tell apart.
+"""
+
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from . import config
+from .config import ConfigTables
+from .simulation import HATE_CHECKS, counts_for_storm
+
+COLORS = ("U", "B", "C")
+
+# Mana sources that are spent when used; every other MANA_PRODUCE card stays
+# in play and untaps each turn.
+ONE_SHOT_MANA = {"Dark Ritual", "Lotus Petal", "Black Lotus"}
+
+# Win probability by turn, index = real turns taken (0 = this turn).
+Distribution = Tuple[float, ...]
+
+
+def _better(a: Distribution, b: Distribution) -> bool:
+    """Prefer the higher win probability, then the earlier expected win."""
+    pa, pb = sum(a), sum(b)
+    if abs(pa - pb) > 1e-12:
+        return pa > pb
+    return sum(t * p for t, p in enumerate(a)) < sum(t * p for t, p in enumerate(b)) - 1e-12
+
+
+def _availability(opponent_profile: Dict[str, float]) -> List[Tuple[int, float]]:
+    """(mask of available hate keys, probability) for one opponent untap."""
+    outcomes = [(0, 1.0)]
+    for bit, key in enumerate(HATE_CHECKS):
+        p = float(opponent_profile.get(key, 0.0))
+        if p <= 0.0:
+            continue
+        nxt = []
+        for mask, q in outcomes:
+            if p < 1.0:
+                nxt.append((mask, q * (1.0 - p)))
+            nxt.append((mask | (1 << bit), q * p))
+        outcomes = nxt
+    return outcomes
+
+
+def _win_distribution(
+    pile: Tuple[str, ...],
+    opponent_profile: Dict[str, float],
+    initial_hand: List[str],
+    base_pool: Tuple[int, ...],
+    max_turns: int,
+    t: ConfigTables
+) -> Distribution:
+    n = len(pile)
+    zero: Distribution = (0.0,) * (max_turns + 1)
+    rolls = _availability(opponent_profile)
+    everything = (1 << len(rolls)) - 1
+    checks = list(HATE_CHECKS.values())
+
+    # Cards are cast in pile order, so the permanents in play are exactly the
+    # mana sources before position i: untap_pools[i] is what untaps then.
+    untap_pools = [base_pool]
+    for card in pile:
+        pool = untap_pools[-1]
+        if card in t.mana_produce and card not in ONE_SHOT_MANA:
+            produced = t.mana_produce[card]
+            pool = tuple(pool[k] + produced.get(c, 0) for k, c in enumerate(COLORS))
+        untap_pools.append(pool)
+
+    # `alive` is a bitmask over `rolls`: the opponent holdings not yet ruled out.
+    @lru_cache(maxsize=None)
+    def weight(alive: int) -> float:
+        return sum(q for r, (_, q) in enumerate(rolls) if alive & (1 << r))
+
+    @lru_cache(maxsize=None)
+    def play(i: int, drawn: int, turn: int, pool: Tuple[int, ...], storm: int, alive: int, extra: int) -> Distribution:
+        best = next_turn(i, drawn, turn, alive, extra)
+        if i < drawn:
+            cast = cast_next(i, drawn, turn, pool, storm, alive, extra)
+            if _better(cast, best):
+                best = cast
+        return best
+
+    def cast_next(i, drawn, turn, pool, storm, alive, extra) -> Distribution:
+        card = pile[i]
+
+        # 1) Mana production
+        if card in t.mana_produce:
+            produced = t.mana_produce[card]
+            pool = tuple(pool[k] + produced.get(c, 0) for k, c in enumerate(COLORS))
+            return play(i + 1, drawn, turn, pool, storm, alive, extra)
+
+        # 2) Pay mana cost (Force of Will is free); if we can't, we must wait
+        if card != "Force of Will":
+            cost = t.mana_costs.get(card, {})
+            if any(amt > (pool[COLORS.index(c)] if c in COLORS else 0) for c, amt in cost.items()):
+                return zero
+            pool = tuple(pool[k] - cost.get(c, 0) for k, c in enumerate(COLORS))
+
+        # 3) Storm
+        if counts_for_storm(card, t):
+            storm += 1
+
+        # 4) Holdings with an applicable hate card counter it (a loss); the
+        #    spell resolving rules them out for the rest of the opponent's turn.
+        hits = sum(1 << bit for bit, counter_func in enumerate(checks) if counter_func(card, storm, t))
+        for r, (mask, _) in enumerate(rolls):
+            if mask & hits:
+                alive &= ~(1 << r)
+        if not alive:
+            return zero
+
+        # 5) Resolution
+        if card == t.oracle:
+            return tuple(weight(alive) if t == turn else 0.0 for t in range(max_turns + 1))
+        if card in t.draw_spells or card in t.draw_counts:
+            drawn = min(n, drawn + t.draw_counts.get(card, 1))
+        if card in t.turn_spells:
+            extra += 1
+        return play(i + 1, drawn, turn, pool, storm, alive, extra)
+
+    @lru_cache(maxsize=None)
+    def next_turn(i: int, drawn: int, turn: int, alive: int, extra: int) -> Distribution:
+        # Untap (one-shot mana empties, storm resets) and draw a card.
+        drawn = min(n, drawn + 1)
+        if extra:
+            # Extra turn: no real turn passes and the opponent does not untap.
+            return play(i, drawn, turn, untap_pools[i], 0, alive, extra - 1)
+        if turn >= max_turns:
+            return zero
+        # The opponent redraws independently of what we have ruled out.
+        w = weight(alive)
+        return tuple(w * p for p in untap_opponent(i, drawn, turn + 1))
+
+    def untap_opponent(i: int, drawn: int, turn: int) -> Distribution:
+        return play(i, drawn, turn, untap_pools[i], 0, everything, 0)
+
+    # Pre-draw from hand, as turns_to_win does
+    drawn = 0
+    for card in initial_hand:
+        drawn += t.draw_counts.get(card, 1 if card in t.draw_spells else 0)
+    return untap_opponent(0, min(n, drawn), 0)
+
+
+def library_order(play_pattern: Sequence[str]) -> Tuple[str, ...]:
+    """The pile as a library: a suggester play pattern without the Doomsday cast."""
+    return tuple(card for card in play_pattern if card != "Doomsday")
+
+
+def _summarize(dist: Distribution) -> Dict[str, Any]:
+    p = sum(dist)
+    return {
+        "win_probability": p,
+        "expected_turns": sum(t * q for t, q in enumerate(dist)) / p if p > 0 else None,
+        "turn_distribution": list(dist),
+    }
+
+
+def simulate_multiturn(
+    pile: Sequence[str],
+    opponent_profile: Dict[str, float],
+    initial_hand: List[str] = None,
+    initial_pool: Dict[str, int] = None,
+    land_drops: int = 0,
+    max_turns: int = 3
+) -> Dict[str, Any]:
+    """
+    Evaluate a pile (in library order) over up to `max_turns` real turns.
+
+    opponent_profile maps hate keys (as in HATE_CHECKS) to the probability
+    that the opponent has that interaction available on any given turn;
+    booleans are accepted (True = every turn). initial_pool and land_drops are
+    the mana that untaps every turn, as do Moxen and lands once cast from the
+    pile; mana from rituals and Lotuses (ONE_SHOT_MANA) only lasts for the
+    turn it is made.
+
+    Returns a dict with:
+      - win_probability: chance of winning within max_turns under the best policy
+      - expected_turns: expected real turns to win, given a win (None if no win)
+      - turn_distribution: win probability for each turn 0..max_turns
+      - best_case_turns: turns to win if the opponent never has interaction
+      - worst_case_turns: turns to win if every profiled hate card is always up
+        (None means the pile cannot win in that scenario)
+    """
+    if initial_hand is None:
+        initial_hand = []
+    pool = dict(initial_pool or {})
+    pool["C"] = pool.get("C", 0) + land_drops
+    base_pool = tuple(pool.get(c, 0) for c in COLORS)
+    pile = tuple(pile)
+    t = config.tables()
+
+    def solve(profile: Dict[str, float]) -> Distribution:
+        return _win_distribution(pile, profile, initial_hand, base_pool, max_turns, t)
+
+    def first_win(dist: Distribution) -> Optional[int]:
+        return next((t for t, p in enumerate(dist) if p > 0.5), None)
+
+    result = _summarize(solve(opponent_profile))
+    result["best_case_turns"] = first_win(solve({}))
+    result["worst_case_turns"] = first_win(solve({
+        key: 1.0 for key, p in opponent_profile.items() if float(p) > 0.0
+    }))
+    return result
+
+
+def rank_multiturn(
+    suggestions: List[Dict[str, Any]],
+    opponent_profile: Dict[str, float],
+    initial_hand: List[str] = None,
+    initial_pool: Dict[str, int] = None,
+    land_drops: int = 0,
+    max_turns: int = 3
+) -> List[Dict[str, Any]]:
+    """
+    Re-rank suggest_viable_piles output on multi-turn risk.
+
+    Each suggestion gets `multiturn_win_probability` and
+    `multiturn_expected_turns`; the list is sorted by win probability
+    (descending) then expected turns. Piles sharing a play pattern are
+    evaluated once.
+    """
+    seen: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+    ranked = []
+    for s in suggestions:
+        library = library_order(s["play_pattern"])
+        if library not in seen:
+            seen[library] = simulate_multiturn(
+                library, opponent_profile, initial_hand, initial_pool, land_drops, max_turns
+            )
+        r = seen[library]
+        ranked.append(dict(
+            s,
+            multiturn_win_probability=r["win_probability"],
+            multiturn_expected_turns=r["expected_turns"],
+        ))
+    ranked.sort(key=lambda x: (
+        -x["multiturn_win_probability"],
+        x["multiturn_expected_turns"] if x["multiturn_expected_turns"] is not None else float("inf"),
+    ))
+    return ranked
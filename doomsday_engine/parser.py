@@ -1,30 +1,187 @@
 """
 parser.py
 
-Parses raw decklist text into a list of card names.
+Parses raw decklists into card counts.
+
+Supported formats:
+  - text: plain "4 Ponder" lists, with or without set codes and collector
+    numbers ("1 Brainstorm (FCA) 28"), "4x" counts, MTGO .txt, Arena and
+    Moxfield exports, including section headers ("Deck", "Sideboard", ...)
+    and "SB:" prefixes. Without any section marker, the last
+    blank-separated block of cards is the sideboard (MTGO .txt).
+  - dek: MTGO .dek XML.
+
+Each format is parsed in a single pass with one precompiled pattern. Card
+names are canonicalized (quotes, spacing, "A/B" vs "A // B" for split and
+double-faced cards) so the same card always maps to the same cache key.
 """
 import re
-from typing import List
+from functools import lru_cache
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Tuple, Union
 
-def parse_decklist(deck_str: str) -> List[str]:
+MAIN = "main"
+SIDEBOARD = "sideboard"
+MAYBEBOARD = "maybeboard"
+
+# Count and name; everything from "(SET)" or a "*F*" marker onwards is dropped.
+_CARD_LINE = re.compile(r"^(SB:\s*)?(\d+)x?\s+([^(*]+)")
+
+_HEADER = re.compile(
+    r"^(?://\s*)?(?P<section>deck|main|mainboard|commander|sideboard|side|sb|"
+    r"companion|maybeboard|maybe|considering)\b[^:\w]*:?\s*(?:\(\d+\))?\s*$",
+    re.I
+)
+
+_SECTIONS = {
+    "deck": MAIN, "main": MAIN, "mainboard": MAIN, "commander": MAIN,
+    "sideboard": SIDEBOARD, "side": SIDEBOARD, "sb": SIDEBOARD, "companion": SIDEBOARD,
+    "maybeboard": MAYBEBOARD, "maybe": MAYBEBOARD, "considering": MAYBEBOARD,
+}
+
+_SPLIT = re.compile(r"\s*/{1,3}\s*")
+_QUOTES = str.maketrans({"’": "'", "‘": "'", "“": '"', "”": '"'})
+
+
+@lru_cache(maxsize=None)
+def canonical_name(name: str) -> str:
     """
-    Convert raw decklist text into a flat list of card names, stripping
-    out set-codes and collector numbers.
+    Normalize a card name: straight quotes, single spaces, and split/DFC
+    names joined with " // " (so "Fire/Ice" and "Fire // Ice" agree).
     """
-    deck = []
-    for raw_line in deck_str.strip().splitlines():
+    name = " ".join(name.translate(_QUOTES).split())
+    if "/" in name:
+        name = " // ".join(_SPLIT.split(name))
+    return name
+
+
+def detect_format(deck_str: str) -> str:
+    """'dek' for MTGO XML, otherwise 'text'."""
+    return "dek" if deck_str.lstrip().startswith("<") else "text"
+
+
+def _add(counts: Dict[str, int], name: str, count: int) -> None:
+    counts[name] = counts.get(name, 0) + count
+
+
+def _parse_text(deck_str: str) -> Dict[str, Dict[str, int]]:
+    sections: Dict[str, Dict[str, int]] = {MAIN: {}}
+    current = sections[MAIN]
+    # Section markers (headers or "SB:" prefixes) anywhere in the text decide
+    # whether blank lines mean anything; see the MTGO rule below.
+    explicit = False
+    # Main-deck cards of each blank-separated block, for the MTGO rule
+    blocks: List[List[Tuple[str, int]]] = [[]]
+    for raw_line in deck_str.splitlines():
         line = raw_line.strip()
-        if not line or line.startswith("#"):
+        if not line:
+            if blocks[-1]:
+                blocks.append([])
             continue
-        m = re.match(r"^(\d+)\s+(.+)$", line)
-        if not m:
+        if line.startswith("#"):
             continue
-        count = int(m.group(1))
-        name_part = m.group(2)
-        # Strip parenthetical set codes
-        name_part = re.sub(r"\s*\([^)]*\)", "", name_part)
-        # Strip trailing numbers
-        name_part = re.sub(r"\s+\d+$", "", name_part)
-        card_name = name_part.strip()
+        m = _CARD_LINE.match(line)
+        if m:
+            sb, count, name = m.groups()
+            name = name.rstrip()
+            # Strip a bare trailing collector number
+            head, _, tail = name.rpartition(" ")
+            if head and tail.isdigit():
+                name = head
+            name, count = canonical_name(name), int(count)
+            if sb:
+                explicit = True
+                _add(sections.setdefault(SIDEBOARD, {}), name, count)
+            else:
+                _add(current, name, count)
+                if current is sections[MAIN]:
+                    blocks[-1].append((name, count))
+            continue
+        h = _HEADER.match(line)
+        if h:
+            explicit = True
+            current = sections.setdefault(_SECTIONS[h.group("section").lower()], {})
+
+    # MTGO .txt has no section markers: the last blank-separated block of
+    # cards is the sideboard (earlier blank lines just group the main deck).
+    blocks = [b for b in blocks if b]
+    if not explicit and len(blocks) > 1:
+        main = sections[MAIN]
+        side = sections.setdefault(SIDEBOARD, {})
+        for name, count in blocks[-1]:
+            main[name] -= count
+            if not main[name]:
+                del main[name]
+            _add(side, name, count)
+    return sections
+
+
+def _parse_dek(deck_str: str) -> Dict[str, Dict[str, int]]:
+    sections: Dict[str, Dict[str, int]] = {MAIN: {}}
+    for card in ET.fromstring(deck_str).iter("Cards"):
+        section = SIDEBOARD if card.get("Sideboard", "false").lower() == "true" else MAIN
+        _add(sections.setdefault(section, {}), canonical_name(card.get("Name", "")), int(card.get("Quantity", 0)))
+    return sections
+
+
+_PARSERS = {"text": _parse_text, "dek": _parse_dek}
+
+
+def parse_deck_sections(deck_str: str, fmt: str = None) -> Dict[str, Dict[str, int]]:
+    """
+    Parse a decklist into {section: {card: count}}. Sections are "main",
+    "sideboard" and "maybeboard"; "main" is always present.
+    `fmt` is "text" or "dek" (auto-detected when omitted).
+    """
+    return _PARSERS[fmt or detect_format(deck_str)](deck_str)
+
+
+def parse_deck_counts(deck_str: str, fmt: str = None, include_sideboard: bool = False) -> Dict[str, int]:
+    """Parse a decklist into a {card: count} mapping of the main deck (optionally plus sideboard)."""
+    sections = parse_deck_sections(deck_str, fmt)
+    counts = dict(sections[MAIN])
+    if include_sideboard:
+        for name, count in sections.get(SIDEBOARD, {}).items():
+            _add(counts, name, count)
+    return counts
+
+
+def parse_decklist(deck_str: str) -> List[str]:
+    """
+    Convert raw decklist text into a flat list of card names, stripping
+    out set-codes and collector numbers. Main deck and sideboard are both
+    included; use parse_deck_counts for a compact, section-aware result.
+    """
+    counts = parse_deck_counts(deck_str, include_sideboard=True)
+    deck = []
+    for card_name, count in counts.items():
         deck.extend([card_name] * count)
-    return deck
\ No newline at end of file
+    return deck
+
+
+DECK_SUFFIXES = (".txt", ".dek")
+
+
+def deck_paths(root: Union[str, Path]) -> List[Path]:
+    """Every decklist file (DECK_SUFFIXES) under `root`, recursively, sorted."""
+    return sorted(p for p in Path(root).rglob("*") if p.suffix.lower() in DECK_SUFFIXES)
+
+
+def iter_decklists(
+    source: Union[str, Path, Iterable[Union[str, Path]]],
+    include_sideboard: bool = False
+) -> Iterator[Tuple[Path, Dict[str, int]]]:
+    """
+    Stream (path, {card: count}) for every decklist file under a directory
+    (recursively) or in an iterable of paths, one file at a time.
+    """
+    if isinstance(source, (str, Path)):
+        root = Path(source)
+        paths: Iterable[Path] = deck_paths(root) if root.is_dir() else [root]
+    else:
+        paths = (Path(p) for p in source)
+    for path in paths:
+        text = path.read_text(encoding="utf-8-sig")
+        fmt = "dek" if path.suffix.lower() == ".dek" else detect_format(text)
+        yield path, parse_deck_counts(text, fmt, include_sideboard)
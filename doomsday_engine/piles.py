@@ -0,0 +1,109 @@
+"""
+piles.py
+
+Bit-packed pile representation used by the search code.
+
+Every unique card in a deck is given a bit index (in sorted name order), so
+a pile is a single int mask and set tests against card categories are mask
+ANDs and popcounts. Card names are only decoded at the API boundary.
+"""
+import itertools
+from typing import Iterable, Iterator, List, Tuple
+
+
+def popcount(mask: int) -> int:
+    """Number of cards in a pile mask."""
+    return mask.bit_count()
+
+
+class CardIndex:
+    """
+    Bidirectional mapping between card names and bit positions.
+
+    Bits are assigned in sorted name order, so decoding a mask yields names
+    in sorted order and combinations of bits enumerate piles in the same
+    lexicographic order as combinations of the sorted names.
+    """
+
+    def __init__(self, cards: Iterable[str]):
+        self.names: List[str] = sorted(set(cards))
+        self.bits = {name: 1 << i for i, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def mask_of(self, cards: Iterable[str]) -> int:
+        """Mask of every card in `cards` that belongs to this index."""
+        mask = 0
+        for card in cards:
+            mask |= self.bits.get(card, 0)
+        return mask
+
+    def decode(self, mask: int) -> Tuple[str, ...]:
+        """Card names in `mask`, in sorted order."""
+        names = self.names
+        out = []
+        i = 0
+        while mask:
+            if mask & 1:
+                out.append(names[i])
+            mask >>= 1
+            i += 1
+        return tuple(out)
+
+    def single_bits(self) -> List[int]:
+        """One mask per card, in index order."""
+        return [1 << i for i in range(len(self.names))]
+
+    def translation(self, other: "CardIndex") -> List[int]:
+        """`other`'s bit for each card of this index (0 where `other` lacks it); see remap."""
+        return [other.bits.get(name, 0) for name in self.names]
+
+
+def remap(mask: int, translation: List[int]) -> int:
+    """Re-express `mask` in another CardIndex, given CardIndex.translation."""
+    out = 0
+    i = 0
+    while mask:
+        if mask & 1:
+            out |= translation[i]
+        mask >>= 1
+        i += 1
+    return out
+
+
+def combination_key(mask: int) -> Tuple[int, ...]:
+    """Bit positions of `mask`, ascending; sorts same-size masks in combination order."""
+    out = []
+    i = 0
+    while mask:
+        if mask & 1:
+            out.append(i)
+        mask >>= 1
+        i += 1
+    return tuple(out)
+
+
+def iter_masks(bits: List[int], size: int) -> Iterator[int]:
+    """Yield the mask of every `size`-combination of `bits`, in combination order."""
+    # Bits are disjoint, so summing a combination is the same as OR-ing it.
+    return map(sum, itertools.combinations(bits, size))
+
+
+def iter_masks_with_any(added: List[int], kept: List[int], size: int) -> Iterator[int]:
+    """Yield every `size`-combination mask of `added` + `kept` that uses a bit of `added`."""
+    for k in range(1, min(size, len(added)) + 1):
+        for a in iter_masks(added, k):
+            for b in iter_masks(kept, size - k):
+                yield a | b
+
+
+def mask_matrix(masks: List[int], width: int):
+    """
+    Unpack pile masks into a (len(masks), width) uint8 NumPy 0/1 matrix.
+    NumPy is imported here so the search path does not depend on it.
+    """
+    import numpy as np
+    nbytes = max(1, (width + 7) // 8)
+    packed = np.frombuffer(b"".join(m.to_bytes(nbytes, "little") for m in masks), dtype=np.uint8)
+    return np.unpackbits(packed.reshape(len(masks), nbytes), axis=1, bitorder="little")[:, :width]
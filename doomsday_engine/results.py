@@ -0,0 +1,95 @@
+"""
+results.py
+
+Columnar (NumPy-backed pandas) pile results for notebooks and the app.
+
+suggest_table returns the same piles, in the same order, as
+suggest_viable_piles, but as one DataFrame built column by column from the
+bit-packed search records instead of a dict per pile:
+
+  - card_1 .. card_5: categorical card columns (categories = the deck's cards)
+  - play_pattern: categorical display string ("A → Doomsday → ... → Oracle");
+    each distinct pattern is joined once, however many piles share it
+  - turns_to_win, storm_count: integer columns
+  - outcome: categorical
+  - leftover_pool, failure_spell (debug only): categorical
+
+Use display_frame to add a "pile" string column for rendering, and
+play_pattern_list to recover the card list for one row.
+"""
+
+from typing import Any, Dict, List
+import numpy as np
+import pandas as pd
+from .piles import mask_matrix
+from .suggester import search_packed
+
+PATTERN_SEP = " → "
+PILE_COLUMNS = [f"card_{i}" for i in range(1, 6)]
+
+
+def format_pool(pool: Dict[str, int]) -> str:
+    return ", ".join(f"{k}:{v}" for k, v in pool.items())
+
+
+def suggest_table(
+    deck: List[str],
+    constraints: Dict[str, Any],
+    opponent_disruption: Dict[str, bool],
+    initial_hand: List[str] = None,
+    initial_pool: Dict[str, int] = None,
+    land_drops: int = 0,
+    top_n: int = 20,
+    debug: bool = False
+) -> pd.DataFrame:
+    """Columnar equivalent of suggest_viable_piles (same arguments, same rows)."""
+    search = search_packed(
+        deck, constraints, opponent_disruption,
+        initial_hand, initial_pool, land_drops, debug
+    )
+    index = search.index
+    records = search.records if debug else search.ranked(top_n)
+    n = len(records)
+    card_categories = pd.Index(index.names)
+
+    # Card columns: positions of the 5 set bits in each row, ascending.
+    bits = mask_matrix([r.mask for r in records], len(index))
+    positions = np.nonzero(bits)[1].reshape(n, 5) if n else np.zeros((0, 5), dtype=np.intp)
+    columns: Dict[str, Any] = {
+        name: pd.Categorical.from_codes(positions[:, i], categories=card_categories)
+        for i, name in enumerate(PILE_COLUMNS)
+    }
+
+    # Play patterns depend only on the pattern bits: join each distinct one once.
+    pattern_codes, pattern_keys = pd.factorize(
+        pd.Series([search.pattern_key(r.mask) for r in records], dtype=object)
+    )
+    columns["play_pattern"] = pd.Categorical.from_codes(
+        pattern_codes,
+        categories=[PATTERN_SEP.join(search.play_pattern(key)) for key in pattern_keys]
+    )
+    columns["turns_to_win"] = np.fromiter((r.turns_to_win for r in records), dtype=np.int16, count=n)
+    columns["outcome"] = pd.Categorical([r.outcome for r in records])
+    columns["storm_count"] = np.fromiter((r.storm_count for r in records), dtype=np.int16, count=n)
+    if debug:
+        columns["leftover_pool"] = pd.Categorical([format_pool(r.leftover_pool) for r in records])
+        columns["failure_spell"] = pd.Categorical([r.failure_spell for r in records])
+    return pd.DataFrame(columns)
+
+
+def pile_strings(table: pd.DataFrame, sep: str = ", ") -> pd.Series:
+    """Vectorized "card, card, ..." string per row."""
+    parts = [table[c].astype(str) for c in PILE_COLUMNS]
+    return parts[0].str.cat(parts[1:], sep=sep)
+
+
+def display_frame(table: pd.DataFrame) -> pd.DataFrame:
+    """suggest_table output with the card columns collapsed into a "pile" string."""
+    out = table.drop(columns=PILE_COLUMNS)
+    out.insert(0, "pile", pile_strings(table))
+    return out
+
+
+def play_pattern_list(pattern: str) -> List[str]:
+    """Card list for one play_pattern display string."""
+    return pattern.split(PATTERN_SEP)
@@ -4,7 +4,7 @@ import os
 import json
 import time
 import re
-import requests
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Dict
 
@@ -17,6 +17,28 @@ CACHE_TTL = 60 * 60 * 24 * 7
 
 SCRYFALL_URL = "https://api.scryfall.com/cards/named"
 
+# Delay before each network request, to be polite to Scryfall.
+REQUEST_DELAY = 0.1
+
+# Set this environment variable (to anything but "" or "0") to serve cached
+# cards only; a cache miss then raises LookupError instead of fetching.
+OFFLINE_ENV = "DOOMSDAY_OFFLINE"
+
+def offline() -> bool:
+    return os.environ.get(OFFLINE_ENV, "") not in ("", "0")
+
+@contextmanager
+def offline_mode():
+    """Serve cached cards only inside the block, unless OFFLINE_ENV is already set."""
+    if OFFLINE_ENV in os.environ:
+        yield
+        return
+    os.environ[OFFLINE_ENV] = "1"
+    try:
+        yield
+    finally:
+        os.environ.pop(OFFLINE_ENV, None)
+
 # --- Cache Functions ---
 
 def _cache_path(card_name: str) -> Path:
@@ -32,10 +54,14 @@ def fetch_card_data(card_name: str) -> Dict:
     path = _cache_path(card_name)
     if path.exists():
         mtime = path.stat().st_mtime
-        if time.time() - mtime < CACHE_TTL:
-            # load from cache
+        if time.time() - mtime < CACHE_TTL or offline():
+            # load from cache (stale entries beat nothing when offline)
             return json.loads(path.read_text(encoding="utf-8"))
-    # otherwise fetch fresh
+    if offline():
+        raise LookupError(f"{card_name!r} is not cached and {OFFLINE_ENV} is set")
+    # otherwise fetch fresh; requests is only imported on a cache miss
+    import requests
+    time.sleep(REQUEST_DELAY)
     resp = requests.get(SCRYFALL_URL, params={"exact": card_name})
     resp.raise_for_status()
     data = resp.json()
@@ -65,5 +91,10 @@ def get_mana_cost(card_name: str) -> Dict[str,int]:
     then parse and return its mana cost dict.
     """
     data = fetch_card_data(card_name)
-    mc = data.get("mana_cost", "")
+    mc = data.get("mana_cost")
+    if (mc is None or "//" in mc) and data.get("card_faces"):
+        # double-faced cards only carry a cost on each face, and split cards
+        # join both ("{1}{R} // {1}{U}"); cast the front face
+        mc = data["card_faces"][0].get("mana_cost", "")
+    mc = mc or ""
     return parse_mana_cost_string(mc)
\ No newline at end of file
@@ -8,23 +8,28 @@ Supports initial mana pool and extra land drops.
 """
 
 from typing import List, Tuple, Dict, Any
-from .config import ORACLE, DRAW_SPELLS, TURN_SPELLS, MANA_PRODUCE, MANA_COSTS
+from . import config
+from .config import ConfigTables
 
-# --- Hate‐check helpers ---
-def _can_counter_fow(card: str, storm_count: int) -> bool:
-    return card in DRAW_SPELLS or card == ORACLE or card in TURN_SPELLS or card == "Doomsday"
+# --- Hate‐check helpers (t: the config snapshot of the running simulation) ---
+def _can_counter_fow(card: str, storm_count: int, t: ConfigTables) -> bool:
+    return card in t.draw_spells or card == t.oracle or card in t.turn_spells or card == "Doomsday"
 
-def _can_counter_pyroblast(card: str, storm_count: int) -> bool:
-    return card in DRAW_SPELLS or card == ORACLE or card in TURN_SPELLS or card == "Doomsday"
+def _can_counter_pyroblast(card: str, storm_count: int, t: ConfigTables) -> bool:
+    return card in t.draw_spells or card == t.oracle or card in t.turn_spells or card == "Doomsday"
 
-def _can_counter_fluster(card: str, storm_count: int) -> bool:
-    return storm_count > 1 and (card in DRAW_SPELLS or card == ORACLE or card == "Doomsday")
+def _can_counter_fluster(card: str, storm_count: int, t: ConfigTables) -> bool:
+    return storm_count > 1 and (card in t.draw_spells or card == t.oracle or card == "Doomsday")
 
-def _can_counter_mindbreak(card: str, storm_count: int) -> bool:
-    return storm_count >= 1 and (card in DRAW_SPELLS or card == ORACLE or card == "Doomsday")
+def _can_counter_mindbreak(card: str, storm_count: int, t: ConfigTables) -> bool:
+    return storm_count >= 1 and (card in t.draw_spells or card == t.oracle or card == "Doomsday")
 
-def _can_counter_dress_down(card: str, storm_count: int) -> bool:
-    return card == ORACLE
+def _can_counter_dress_down(card: str, storm_count: int, t: ConfigTables) -> bool:
+    return card == t.oracle
+
+def counts_for_storm(card: str, t: ConfigTables) -> bool:
+    """Whether casting `card` adds to storm; the one rule every simulator uses."""
+    return card in t.draw_spells or card in t.turn_spells or card in {"Doomsday", t.oracle, "Force of Will"}
 
 HATE_CHECKS = {
     "has_force_of_will": _can_counter_fow,
@@ -39,7 +44,8 @@ def simulate_pile(
     opponent_disruption: Dict[str, bool],
     initial_hand: List[str] = None,
     initial_pool: Dict[str, int] = None,
-    land_drops: int = 0
+    land_drops: int = 0,
+    tables: ConfigTables = None
 ) -> Tuple[str, int]:
     """
     Simulate resolving the given play_pattern against enabled opponent disruptions.
@@ -51,10 +57,13 @@ def simulate_pile(
       - mana costs (MANA_COSTS),
       - Force of Will alternate cost.
 
+    tables is the config snapshot to use (default: the current one).
+
     Returns (outcome, storm_count):
       - outcome: "win", "insufficient_mana_for_<card>", or hate_key
       - storm_count: number of spells cast when outcome occurred
     """
+    t = tables or config.tables()
     # --- Initialize hand and mana pool ---
     if initial_hand is None:
         initial_hand = []
@@ -70,14 +79,14 @@ def simulate_pile(
 
     for card in play_pattern:
         # 1) Mana production step
-        if card in MANA_PRODUCE:
-            for color, amt in MANA_PRODUCE[card].items():
+        if card in t.mana_produce:
+            for color, amt in t.mana_produce[card].items():
                 pool[color] = pool.get(color, 0) + amt
             continue
 
         # 2) Pay mana cost (skip cost for Force of Will)
         if card != "Force of Will":
-            cost = MANA_COSTS.get(card, {})
+            cost = t.mana_costs.get(card, {})
             for color, amt in cost.items():
                 if pool.get(color, 0) < amt:
                     # Can't pay for this spell
@@ -86,17 +95,17 @@ def simulate_pile(
                 pool[color] -= amt
 
         # 3) Spell cast: increment storm_count for instants/sorceries, Doomsday, Oracle, FoW
-        if card in DRAW_SPELLS or card in TURN_SPELLS or card in {"Doomsday", ORACLE, "Force of Will"}:
+        if counts_for_storm(card, t):
             storm_count += 1
 
         # 4) Opponent hate checks
         for hate_key, counter_func in HATE_CHECKS.items():
             if opponent_disruption.get(hate_key, False):
-                if counter_func(card, storm_count):
+                if counter_func(card, storm_count, t):
                     return hate_key, storm_count
 
         # 5) Oracle resolves => win
-        if card == ORACLE:
+        if card == t.oracle:
             return "win", storm_count
 
     # If we never cast Oracle
@@ -108,7 +117,8 @@ def simulate_detailed_pile(
     opponent_disruption: Dict[str, bool],
     initial_hand: List[str] = None,
     initial_pool: Dict[str, int] = None,
-    land_drops: int = 0
+    land_drops: int = 0,
+    tables: ConfigTables = None
 ) -> List[Dict[str, Any]]:
     """
     Step-by-step simulation with:
@@ -117,8 +127,9 @@ def simulate_detailed_pile(
       - spell type (mana_production, cast_spell, failed_cast),
       - vulnerabilities and outcome.
 
-    Supports the same initial_hand, initial_pool, land_drops parameters.
+    Supports the same initial_hand, initial_pool, land_drops and tables parameters.
     """
+    t = tables or config.tables()
     if initial_hand is None:
         initial_hand = []
     if initial_pool:
@@ -143,15 +154,15 @@ def simulate_detailed_pile(
         }
 
         # Mana production
-        if card in MANA_PRODUCE:
+        if card in t.mana_produce:
             step["type"] = "mana_production"
-            for color, amt in MANA_PRODUCE[card].items():
+            for color, amt in t.mana_produce[card].items():
                 pool[color] = pool.get(color, 0) + amt
 
         else:
             # Pay cost
             if card != "Force of Will":
-                cost = MANA_COSTS.get(card, {})
+                cost = t.mana_costs.get(card, {})
                 for color, amt in cost.items():
                     if pool.get(color, 0) < amt:
                         step["type"] = "failed_cast"
@@ -166,15 +177,16 @@ def simulate_detailed_pile(
 
             # Increment storm if it was a spell
             if step["type"] == "cast_spell":
-                if card in (DRAW_SPELLS - {"Street Wraith"}) or card in TURN_SPELLS or card in {"Doomsday", ORACLE, "Force of Will"}:
+                if counts_for_storm(card, t):
                     storm_count += 1
-                # Check hate
+                # Check hate; the first applicable one counters, as in simulate_pile
                 for hate_key, counter_func in HATE_CHECKS.items():
-                    if opponent_disruption.get(hate_key, False) and counter_func(card, storm_count):
+                    if opponent_disruption.get(hate_key, False) and counter_func(card, storm_count, t):
                         step["vulnerable_to"].append(hate_key)
-                        step["outcome"] = hate_key
+                if step["vulnerable_to"]:
+                    step["outcome"] = step["vulnerable_to"][0]
                 # Oracle win
-                if card == ORACLE and step["outcome"] is None:
+                if card == t.oracle and step["outcome"] is None:
                     step["outcome"] = "win"
 
         step["pool_after"] = pool.copy()
@@ -2,106 +2,280 @@
 suggester.py
 
 Generate Doomsday piles with detailed debug metrics when requested.
+
+Piles are searched as bit-packed masks (see piles.py); card names are only
+decoded for the piles that are actually returned. search_packed hands the
+packed records to callers that rank, count or tabulate piles themselves.
 """
 
-import itertools
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Iterable, NamedTuple, Optional, Union
 from .parser import parse_decklist
-from .config import DRAW_SPELLS, MANA_SOURCES, ORACLE, PROTECTION_SPELLS, TURN_SPELLS
+from . import config
+from .config import ConfigTables
+from .piles import CardIndex, iter_masks, iter_masks_with_any, popcount
 from .turns import turns_to_win
 from .simulation import simulate_pile, simulate_detailed_pile
 
-def suggest_viable_piles(
-    deck: List[str],
+LIFE_LOSS_CARDS = {"Gitaxian Probe", "Street Wraith"}
+
+
+class PileRecord(NamedTuple):
+    """Compact search result for one pile; `mask` is relative to a CardIndex."""
+    mask: int
+    turns_to_win: int
+    outcome: str
+    storm_count: int
+    leftover_pool: Optional[Dict[str, int]] = None
+    failure_spell: Optional[str] = None
+
+
+class _Categories:
+    """Category masks for a CardIndex under one config snapshot, computed once per search."""
+
+    def __init__(self, index: CardIndex, tables: ConfigTables = None):
+        t = self.tables = tables or config.tables()
+        self.oracle = index.mask_of([t.oracle])
+        self.draw = index.mask_of(t.draw_spells)
+        self.mana = index.mask_of(t.mana_sources)
+        self.protection = index.mask_of(t.protection_spells)
+        self.turn = index.mask_of(t.turn_spells)
+        self.life = index.mask_of(LIFE_LOSS_CARDS)
+        # Only these bits influence the play pattern (Oracle is always appended).
+        self.pattern = self.mana | self.turn | self.protection | self.draw
+
+
+def _candidate_masks(
+    index: CardIndex,
     constraints: Dict[str, Any],
-    opponent_disruption: Dict[str, bool],
-    initial_hand: List[str] = None,
-    initial_pool: Dict[str, int] = None,
-    land_drops: int = 0,
-    top_n: int = 20,
-    debug: bool = False
-) -> List[Dict[str, Any]]:
+    tables: ConfigTables = None,
+    only_with: int = 0
+) -> Iterable[int]:
     """
-    Generate Doomsday piles, with optional debug output.
+    Every 5-card pile mask worth filtering, in combination order.
 
-    If debug=True, returns ALL candidate piles with extra fields:
-      - leftover_pool: dict of mana left after simulation
-      - failure_spell: the card at which it failed (or None for wins)
-    Otherwise, returns only the top_n piles sorted by win/outcome and turns_to_win.
+    When Oracle is mandatory only piles containing it are enumerated; fixing
+    one card does not change the relative order of the remaining piles.
+    A non-zero `only_with` mask restricts the piles to those using at least
+    one of its cards (in no particular order).
     """
-    if initial_hand is None:
-        initial_hand = []
-    if initial_pool is None:
-        initial_pool = {}
+    bits = index.single_bits()
+    need_oracle = constraints.get("must_include_oracle", True)
+    oracle = index.mask_of([(tables or config.tables()).oracle])
+    if need_oracle and not oracle:
+        return iter(())
+    if not only_with or only_with == index.mask_of(index.names) or (need_oracle and only_with & oracle):
+        # Every candidate qualifies (or is easier enumerated whole)
+        if not need_oracle:
+            return iter_masks(bits, 5)
+        return (oracle | m for m in iter_masks([b for b in bits if b != oracle], 4))
+    added = [b for b in bits if b & only_with]
+    kept = [b for b in bits if not b & only_with]
+    if not need_oracle:
+        return iter_masks_with_any(added, kept, 5)
+    # Oracle is mandatory and not new: fix it and pick 4 more, one of them new
+    kept.remove(oracle)
+    return (oracle | m for m in iter_masks_with_any(added, kept, 4))
+
+
+def _play_pattern(index: CardIndex, cats: _Categories, mask: int) -> List[str]:
+    return (
+        list(index.decode(mask & cats.mana))
+        + list(index.decode(mask & cats.turn))
+        + ["Doomsday"]
+        + list(index.decode(mask & cats.protection))
+        + list(index.decode(mask & cats.draw))
+        + [cats.tables.oracle]
+    )
+
+
+def _search_records(
+    index: CardIndex,
+    masks: Iterable[int],
+    constraints: Dict[str, Any],
+    opponent_disruption: Dict[str, bool],
+    initial_hand: List[str],
+    initial_pool: Dict[str, int],
+    land_drops: int,
+    debug: bool,
+    tables: ConfigTables = None
+) -> List[PileRecord]:
+    """
+    Filter and simulate every pile in `masks`, returning unsorted PileRecords.
 
-    unique_cards = list(set(deck))
-    suggestions: List[Dict[str, Any]] = []
+    Piles that share a play pattern (they differ only in cards the pattern
+    ignores, e.g. tutors or fetchlands) are simulated once.
+    """
+    t = tables or config.tables()
+    cats = _Categories(index, t)
+    need_oracle = constraints.get("must_include_oracle", True)
+    need_draw = constraints.get("must_include_draw", True)
+    min_mana = constraints.get("min_mana_sources", 1)
+    max_life = constraints.get("max_life_loss", 20)
 
-    for pile in itertools.combinations(unique_cards, 5):
-        s = set(pile)
+    seen: Dict[int, tuple] = {}
+    records: List[PileRecord] = []
 
+    for mask in masks:
         # Basic constraints:
-        if constraints.get("must_include_oracle", True) and ORACLE not in s:
+        if need_oracle and not mask & cats.oracle:
             continue
-        if constraints.get("must_include_draw", True) and not (s & DRAW_SPELLS):
+        if need_draw and not mask & cats.draw:
             continue
-        if len(s & MANA_SOURCES) < constraints.get("min_mana_sources", 1):
+        if popcount(mask & cats.mana) < min_mana:
             continue
-        life_loss = len(s & {"Gitaxian Probe", "Street Wraith"}) * 2
-        if life_loss > constraints.get("max_life_loss", 20):
+        if popcount(mask & cats.life) * 2 > max_life:
             continue
 
-        # Build the play pattern
-        mana         = sorted([c for c in pile if c in MANA_SOURCES])
-        turn_spells  = sorted([c for c in pile if c in TURN_SPELLS])
-        protections  = sorted([c for c in pile if c in PROTECTION_SPELLS])
-        draw_spells  = sorted([c for c in pile if c in DRAW_SPELLS])
-        play_pattern = mana + turn_spells + ["Doomsday"] + protections + draw_spells + [ORACLE]
+        key = mask & cats.pattern
+        result = seen.get(key)
+        if result is None:
+            play_pattern = _play_pattern(index, cats, mask)
 
-        # Estimate turns to win
-        turns = turns_to_win(tuple(play_pattern), initial_hand)
+            # Estimate turns to win
+            turns = turns_to_win(tuple(play_pattern), initial_hand, tables=t)
 
-        # Simulate (summary or detailed)
-        if debug:
-            steps = simulate_detailed_pile(
-                play_pattern,
-                opponent_disruption,
-                initial_hand,
-                initial_pool,
-                land_drops
-            )
-            last = steps[-1]
-            outcome       = last.get("outcome", "no_oracle")
-            storm_count   = last.get("storm_after", 0)
-            leftover_pool = last.get("pool_after", {}).copy()
-            failure_spell = last.get("card") if outcome != "win" else None
-        else:
-            outcome, storm_count = simulate_pile(
-                play_pattern,
-                opponent_disruption,
-                initial_hand,
-                initial_pool,
-                land_drops
-            )
-            leftover_pool = {}
-            failure_spell = None
+            # Simulate (summary or detailed)
+            if debug:
+                steps = simulate_detailed_pile(
+                    play_pattern,
+                    opponent_disruption,
+                    initial_hand,
+                    initial_pool,
+                    land_drops,
+                    tables=t
+                )
+                last = steps[-1]
+                outcome       = last.get("outcome", "no_oracle")
+                storm_count   = last.get("storm_after", 0)
+                leftover_pool = last.get("pool_after", {}).copy()
+                failure_spell = last.get("card") if outcome != "win" else None
+                result = (turns, outcome, storm_count, leftover_pool, failure_spell)
+            else:
+                outcome, storm_count = simulate_pile(
+                    play_pattern,
+                    opponent_disruption,
+                    initial_hand,
+                    initial_pool,
+                    land_drops,
+                    tables=t
+                )
+                result = (turns, outcome, storm_count)
+            seen[key] = result
+
+        records.append(PileRecord(mask, *result))
 
+    return records
+
+
+def _rank_key(record: PileRecord):
+    return (record.outcome != "win", record.turns_to_win)
+
+
+class PackedSearch:
+    """
+    The records of one pile search, still bit-packed.
+
+    `records` are in combination order (the order piles were enumerated) and
+    their masks are relative to `index`; decode only the ones you return.
+    """
+
+    def __init__(self, index: CardIndex, cats: _Categories, records: List[PileRecord]):
+        self.index = index
+        self.cats = cats
+        self.records = records
+
+    def ranked(self, top_n: Optional[int] = None) -> List[PileRecord]:
+        """Records in suggest_viable_piles order (ties keep combination order)."""
+        return sorted(self.records, key=_rank_key)[:top_n]
+
+    def best(self) -> Optional[PileRecord]:
+        """The first record ranked() would return, without sorting."""
+        return min(self.records, key=_rank_key, default=None)
+
+    def pattern_key(self, mask: int) -> int:
+        """The bits of `mask` that decide its play pattern."""
+        return mask & self.cats.pattern
+
+    def play_pattern(self, mask: int) -> List[str]:
+        return _play_pattern(self.index, self.cats, mask)
+
+    def decode(self, record: PileRecord, debug: bool = False) -> Dict[str, Any]:
+        """The suggest_viable_piles entry for `record`."""
         entry: Dict[str, Any] = {
-            "pile": pile,
-            "play_pattern": play_pattern,
-            "turns_to_win": turns,
-            "outcome": outcome,
-            "storm_count": storm_count,
+            "pile": self.index.decode(record.mask),
+            "play_pattern": self.play_pattern(record.mask),
+            "turns_to_win": record.turns_to_win,
+            "outcome": record.outcome,
+            "storm_count": record.storm_count,
         }
         if debug:
-            entry["leftover_pool"] = leftover_pool
-            entry["failure_spell"] = failure_spell
+            entry["leftover_pool"] = dict(record.leftover_pool)
+            entry["failure_spell"] = record.failure_spell
+        return entry
 
-        suggestions.append(entry)
 
-    # If not debugging, sort and truncate
-    if not debug:
-        suggestions.sort(key=lambda x: (x["outcome"] != "win", x["turns_to_win"]))
-        return suggestions[:top_n]
+def search_packed(
+    deck: Union[Iterable[str], CardIndex],
+    constraints: Dict[str, Any],
+    opponent_disruption: Dict[str, bool],
+    initial_hand: List[str] = None,
+    initial_pool: Dict[str, int] = None,
+    land_drops: int = 0,
+    debug: bool = False,
+    only_with: Iterable[str] = None
+) -> PackedSearch:
+    """
+    Search every candidate pile of `deck` without decoding any names.
+
+    This is the search behind suggest_viable_piles, for callers that rank,
+    count or tabulate piles themselves. `deck` may be a CardIndex already
+    built for it. `only_with` restricts the search to piles using at least
+    one of those cards (e.g. the cards just added to a deck).
+    """
+    if initial_hand is None:
+        initial_hand = []
+    if initial_pool is None:
+        initial_pool = {}
+    t = config.tables()
+    index = deck if isinstance(deck, CardIndex) else CardIndex(deck)
+    if only_with is None:
+        masks = _candidate_masks(index, constraints, t)
+    else:
+        required = index.mask_of(only_with)
+        masks = _candidate_masks(index, constraints, t, required) if required else iter(())
+    records = _search_records(
+        index, masks, constraints, opponent_disruption,
+        initial_hand, initial_pool, land_drops, debug, tables=t
+    )
+    return PackedSearch(index, _Categories(index, t), records)
 
-    return suggestions
\ No newline at end of file
+
+def suggest_viable_piles(
+    deck: List[str],
+    constraints: Dict[str, Any],
+    opponent_disruption: Dict[str, bool],
+    initial_hand: List[str] = None,
+    initial_pool: Dict[str, int] = None,
+    land_drops: int = 0,
+    top_n: int = 20,
+    debug: bool = False
+) -> List[Dict[str, Any]]:
+    """
+    Generate Doomsday piles, with optional debug output.
+
+    If debug=True, returns ALL candidate piles with extra fields:
+      - leftover_pool: dict of mana left after simulation
+      - failure_spell: the card at which it failed (or None for wins)
+    Otherwise, returns only the top_n piles sorted by win/outcome and turns_to_win
+    (top_n=None returns every candidate, sorted).
+
+    For large result sets, results.suggest_table returns the same piles as a
+    columnar DataFrame without building a dict per pile.
+    """
+    search = search_packed(
+        deck, constraints, opponent_disruption,
+        initial_hand, initial_pool, land_drops, debug
+    )
+    # If not debugging, sort and truncate before decoding any names
+    records = search.records if debug else search.ranked(top_n)
+    return [search.decode(r, debug) for r in records]
@@ -5,7 +5,8 @@ notebook_utils.py
 Helper functions for using the doomsday_engine package in notebooks.
 """
 import pandas as pd
-from doomsday_engine import parse_decklist, suggest_viable_piles
+from doomsday_engine import parse_decklist
+from doomsday_engine.results import suggest_table, display_frame
 
 def load_deck_from_text(deck_text: str) -> list:
     """
@@ -23,30 +24,19 @@ def generate_suggestions(
     """
     Generate a DataFrame of suggested Doomsday piles with metadata.
     Columns include:
-      - 'pile', 'play_pattern', 'turns_to_win', 'outcome',
-        'storm_count', 'risk_score', 'vulnerabilities', 'protection_count'
+      - 'pile', 'play_pattern', 'turns_to_win', 'outcome', 'storm_count'
+    'play_pattern' is a categorical display string; see
+    doomsday_engine.results.play_pattern_list to get the card list back.
     """
     # Parse the deck list into card names
     deck = load_deck_from_text(deck_text)
 
-    # Get suggestions
-    suggestions = suggest_viable_piles(
+    # Get suggestions as a columnar table
+    table = suggest_table(
         deck,
         constraints,
         opponent_disruption,
         initial_hand,
-        top_n
+        top_n=top_n
     )
-
-    # Convert to DataFrame
-    df = pd.DataFrame(suggestions)
-
-    # Make play_pattern display nicely as a string
-    if 'play_pattern' in df.columns:
-        df['play_pattern'] = df['play_pattern'].apply(lambda seq: ' → '.join(seq))
-
-    # Ensure vulnerabilities is a comma-separated string
-    if 'vulnerabilities' in df.columns:
-        df['vulnerabilities'] = df['vulnerabilities'].apply(lambda v: ', '.join(v))
-
-    return df
+    return display_frame(table)
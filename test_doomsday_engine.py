@@ -29,6 +29,12 @@ SAMPLE_DECK_TEXT = """
 def sample_deck():
     return parse_decklist(SAMPLE_DECK_TEXT)
 
+@pytest.fixture
+def mocked_costs():
+    """`with mocked_costs(table):` runs with MANA_COSTS replaced by `table`."""
+    from doomsday_engine.config import override_costs
+    return override_costs
+
 def test_parse_decklist_counts(sample_deck):
     assert sample_deck.count("Thassa's Oracle") == 1
     assert sample_deck.count("Brainstorm") == 1
@@ -98,3 +104,486 @@ def test_suggest_viable_piles_basic(sample_deck):
     suggestions = suggest_viable_piles(sample_deck, constraints, od, initial_hand=None, top_n=5)
     assert isinstance(suggestions, list)
     assert all(isinstance(s["pile"], tuple) and len(s["pile"]) == 5 for s in suggestions)
+
+def test_card_index_roundtrip():
+    from doomsday_engine.piles import CardIndex, popcount
+    index = CardIndex(["Ponder", "Brainstorm", "Ponder", ORACLE])
+    mask = index.mask_of(["Ponder", ORACLE])
+    assert popcount(mask) == 2
+    assert index.decode(mask) == ("Ponder", ORACLE)
+    assert index.mask_of(["Not In Deck"]) == 0
+
+def test_suggest_viable_piles_decodes_sorted_piles(sample_deck):
+    deck = sample_deck + ["Ponder", "Gush", "Island"]
+    suggestions = suggest_viable_piles(deck, {}, {}, top_n=None)
+    assert suggestions
+    assert all(ORACLE in s["pile"] for s in suggestions)
+    assert all(list(s["pile"]) == sorted(s["pile"]) for s in suggestions)
+    assert all(s["play_pattern"][-1] == ORACLE for s in suggestions)
+
+def test_batch_run_is_resumable(tmp_path, monkeypatch, mocked_costs):
+    import csv
+    import json
+    from doomsday_engine import config
+    from doomsday_engine.batch import run_batch
+    fetched = []
+    monkeypatch.setattr(config, "get_mana_cost", lambda card: fetched.append(card) or {"B": 9})
+    deck_dir = tmp_path / "decks"
+    deck_dir.mkdir()
+    (deck_dir / "mini.txt").write_text(SAMPLE_DECK_TEXT + "1 Ponder\n1 Island\n1 Archive Only Card\n", encoding="utf-8")
+    profiles = tmp_path / "profiles.json"
+    profiles.write_text(json.dumps({
+        "none": {},
+        "fow": {"opponent_disruption": {"has_force_of_will": True}, "land_drops": 1},
+    }), encoding="utf-8")
+    out = tmp_path / "results.csv"
+
+    deck = parse_decklist(SAMPLE_DECK_TEXT) + ["Ponder", "Island", "Archive Only Card"]
+    unknown = sorted(set(deck) - config.MANA_COSTS.keys())
+    with mocked_costs(dict(config.MANA_COSTS)):
+        assert run_batch(deck_dir, profiles, out, workers=1) == 2
+        # Cards outside decks/ are looked up once, up front, and used by the jobs
+        assert "Archive Only Card" in unknown and fetched == unknown
+        assert config.MANA_COSTS["Archive Only Card"] == {"B": 9}
+        assert run_batch(deck_dir, profiles, out, workers=1) == 0
+        best = suggest_viable_piles(deck, {}, {}, top_n=1)[0]
+    with open(out, newline="", encoding="utf-8") as f:
+        rows = {r["profile"]: r for r in csv.DictReader(f)}
+    assert sorted(rows) == ["fow", "none"]
+    assert all(r["deck"] == "mini.txt" and int(r["candidates"]) > 0 for r in rows.values())
+    assert rows["none"]["best_pile"] == "; ".join(best["pile"])
+    assert int(rows["none"]["best_turns"]) == best["turns_to_win"]
+
+def test_batch_keeps_suffixes_and_survives_failing_jobs(tmp_path, monkeypatch, mocked_costs):
+    from doomsday_engine import batch, config
+    monkeypatch.setattr(config, "get_mana_cost", lambda card: {})
+    deck_dir = tmp_path / "decks"
+    deck_dir.mkdir()
+    (deck_dir / "x.txt").write_text(SAMPLE_DECK_TEXT + "1 Ponder\n", encoding="utf-8")
+    (deck_dir / "x.dek").write_text(
+        '<Deck><Cards Quantity="1" Sideboard="false" Name="Ponder"/></Deck>', encoding="utf-8"
+    )
+    assert sorted(batch.load_decks(deck_dir)) == ["x.dek", "x.txt"]
+    profiles = tmp_path / "profiles.json"
+    profiles.write_text('{"none": {}}', encoding="utf-8")
+    out = tmp_path / "results.csv"
+
+    run_job = batch.run_job
+    def flaky(deck_name, *args):
+        if deck_name == "x.dek":
+            raise RuntimeError("boom")
+        return run_job(deck_name, *args)
+
+    monkeypatch.setattr(batch, "run_job", flaky)
+    with mocked_costs(dict(config.MANA_COSTS)):
+        with pytest.raises(batch.BatchFailed) as failed:
+            batch.run_batch(deck_dir, profiles, out, workers=1)
+    assert failed.value.completed == 1
+    assert list(failed.value.failures) == [("x.dek", "none")]
+    # The finished job is written; the failed one is left for a rerun
+    assert batch.completed_jobs(out) == {("x.txt", "none")}
+
+def test_fuzz_engines_agree_with_reference():
+    from doomsday_engine.fuzz import run_fuzz
+    assert run_fuzz(iterations=60, seed=0) == []
+
+def test_fuzz_minimizes_counterexample():
+    from doomsday_engine.fuzz import ENGINES, run_fuzz
+
+    def broken(case, debug):
+        return [e for e in ENGINES["packed"].run(case, debug) if "Ponder" not in e["pile"]]
+
+    failures = run_fuzz(iterations=100, seed=3, engines={"broken": broken})
+    assert len(failures) == 1
+    case = failures[0].case
+    assert "Ponder" in case.deck and len(case.deck) == 5
+    assert not any(case.opponent_disruption.values())
+
+def test_fuzz_play_patterns_hold():
+    from doomsday_engine.fuzz import run_pattern_fuzz
+    assert run_pattern_fuzz(iterations=300, seed=0) == []
+
+def test_fuzz_minimizes_play_pattern_counterexample():
+    from doomsday_engine.fuzz import PATTERN_CHECKS, run_pattern_fuzz
+
+    def broken(case):
+        expected, actual = PATTERN_CHECKS["simulators_agree"](case)
+        return expected, ("win", 0) if "Force of Will" in case.play_pattern else actual
+
+    failures = run_pattern_fuzz(iterations=100, seed=3, checks={"broken": broken})
+    assert len(failures) == 1
+    assert failures[0].case.play_pattern == ["Force of Will"]
+
+def test_fuzz_leaves_environment_alone():
+    import os
+    env = {k: v for k, v in os.environ.items() if k != "DOOMSDAY_OFFLINE"}
+    elapsed, imported, ran, loaded = _run_isolated(
+        "import os, sys, time\n"
+        "t = time.perf_counter()\n"
+        "import doomsday_engine.fuzz as fuzz\n"
+        "elapsed = time.perf_counter() - t\n"
+        "imported = 'DOOMSDAY_OFFLINE' in os.environ\n"
+        "fuzz.run_pattern_fuzz(iterations=2, seed=0)\n"
+        "print(elapsed, imported, 'DOOMSDAY_OFFLINE' in os.environ, 'requests' in sys.modules)\n",
+        env=env
+    )
+    assert float(elapsed) < IMPORT_BUDGET_S
+    # Offline only while fuzzing, so the config build never fetches
+    assert (imported, ran, loaded) == ("False", "False", "False")
+
+# Import-time budget for the lightweight entry points (seconds).
+IMPORT_BUDGET_S = 0.5
+
+def _run_isolated(code, env=None):
+    import subprocess
+    import sys
+    from pathlib import Path
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=Path(__file__).parent, capture_output=True, text=True, check=True, env=env
+    )
+    return out.stdout.split()
+
+def test_parse_decklist_import_is_lightweight():
+    elapsed, heavy = _run_isolated(
+        "import sys, time\n"
+        "t = time.perf_counter()\n"
+        "from doomsday_engine import parse_decklist\n"
+        "elapsed = time.perf_counter() - t\n"
+        "parse_decklist('1 Ponder')\n"
+        "heavy = [m for m in ('pandas', 'requests', 'doomsday_engine.config') if m in sys.modules]\n"
+        "print(elapsed, ','.join(heavy) or '-')\n"
+    )
+    assert heavy == "-"
+    assert float(elapsed) < IMPORT_BUDGET_S
+
+def test_simulate_pile_import_is_lightweight():
+    import os
+    env = {k: v for k, v in os.environ.items() if k != "DOOMSDAY_OFFLINE"}
+    elapsed, loaded, heavy = _run_isolated(
+        "import os, sys, time\n"
+        "t = time.perf_counter()\n"
+        "from doomsday_engine import simulate_pile\n"
+        "elapsed = time.perf_counter() - t\n"
+        "from doomsday_engine import config\n"
+        "loaded = config._TABLES is not None or 'requests' in sys.modules\n"
+        # The first call builds the config; keep it off the network here
+        "os.environ['DOOMSDAY_OFFLINE'] = '1'\n"
+        "simulate_pile(['Brainstorm', config.ORACLE], {})\n"
+        "heavy = [m for m in ('pandas', 'numpy', 'requests') if m in sys.modules]\n"
+        "print(elapsed, loaded, ','.join(heavy) or '-')\n",
+        env=env
+    )
+    # Importing builds nothing: no deck scan, no Scryfall lookups
+    assert loaded == "False"
+    assert heavy == "-"
+    assert float(elapsed) < IMPORT_BUDGET_S
+
+def test_simulation_does_not_import_pandas():
+    (loaded,) = _run_isolated(
+        "import sys\n"
+        "import doomsday_engine\n"
+        "doomsday_engine.simulate_pile\n"
+        "doomsday_engine.suggest_viable_piles\n"
+        "print('pandas' in sys.modules)\n"
+    )
+    assert loaded == "False"
+
+def test_simulate_multiturn_without_interaction(mocked_costs):
+    from doomsday_engine import simulate_multiturn
+    with mocked_costs({}):
+        r = simulate_multiturn(["Brainstorm", ORACLE], {})
+    assert r["win_probability"] == pytest.approx(1.0)
+    assert r["best_case_turns"] == r["worst_case_turns"] == 1
+
+def test_simulate_multiturn_spreads_casts_against_flusterstorm(mocked_costs):
+    from doomsday_engine import simulate_multiturn
+    pile = ["Ponder", "Brainstorm", ORACLE]
+    with mocked_costs({}):
+        always = simulate_multiturn(pile, {"has_flusterstorm": True})
+        half = simulate_multiturn(pile, {"has_flusterstorm": 0.5})
+        force = simulate_multiturn(pile, {"has_force_of_will": True})
+    # Casting one spell per turn keeps storm at 1, so it still wins on turn 3
+    assert always["win_probability"] == pytest.approx(1.0)
+    assert always["worst_case_turns"] == 3
+    # We cannot see whether Flusterstorm is up, so a coin flip plays the same line
+    assert half["turn_distribution"] == pytest.approx(always["turn_distribution"])
+    assert force["win_probability"] == 0.0 and force["worst_case_turns"] is None
+
+def test_simulate_multiturn_policy_cannot_see_opponent_hand(mocked_costs):
+    from doomsday_engine import simulate_multiturn
+    with mocked_costs({}):
+        r = simulate_multiturn(["Brainstorm", ORACLE], {"has_force_of_will": 0.5})
+    # Waiting reveals nothing, so every line is countered half the time
+    assert r["win_probability"] == pytest.approx(0.5)
+
+def test_simulate_multiturn_keeps_mana_permanents(mocked_costs):
+    from doomsday_engine import simulate_multiturn
+    with mocked_costs({ORACLE: {"U": 2}}):
+        mox = simulate_multiturn(["Mox Sapphire", "Brainstorm", ORACLE], {}, initial_pool={"U": 1})
+    with mocked_costs({ORACLE: {"C": 1}, "Ponder": {"C": 1}}):
+        land = simulate_multiturn(["Watery Grave", "Ponder", ORACLE], {})
+        petal = simulate_multiturn(["Lotus Petal", "Ponder", ORACLE], {})
+    # The Mox cast on turn 1 untaps with the Island on turn 2
+    assert mox["best_case_turns"] == 2
+    # A land pays for Ponder on turn 2 and Oracle on turn 3; a Lotus Petal
+    # is sacrificed, so it can only pay for one of them
+    assert land["best_case_turns"] == 3
+    assert petal["win_probability"] == 0.0
+
+def test_rank_multiturn_orders_by_win_probability(sample_deck):
+    from doomsday_engine import rank_multiturn
+    deck = sample_deck + ["Ponder", "Gush", "Island", "Time Walk"]
+    ranked = rank_multiturn(suggest_viable_piles(deck, {}, {}, top_n=None), {"has_flusterstorm": 0.5})
+    probs = [r["multiturn_win_probability"] for r in ranked]
+    assert probs == sorted(probs, reverse=True)
+
+def test_incremental_search_matches_full_search(sample_deck):
+    from doomsday_engine import IncrementalSearch
+    od = {"has_flusterstorm": True}
+    deck = sample_deck + ["Ponder", "Gush", "Island", "Mox Jet", "Time Walk"]
+    search = IncrementalSearch({}, od)
+    search.update(deck, top_n=None)
+    full = search.last_simulated
+
+    swapped = [c for c in deck if c != "Ponder"] + ["Preordain"]
+    assert search.update(swapped, top_n=None) == suggest_viable_piles(swapped, {}, od, top_n=None)
+    assert 0 < search.last_simulated < full
+    # Nothing added: nothing to simulate
+    assert search.update(swapped[1:], top_n=None) == suggest_viable_piles(swapped[1:], {}, od, top_n=None)
+    assert search.last_simulated == 0
+
+def test_incremental_search_enumerates_only_oracle_piles(sample_deck):
+    from math import comb
+    from doomsday_engine.piles import CardIndex
+    from doomsday_engine.suggester import _candidate_masks
+    index = CardIndex(sample_deck + ["Ponder", "Gush", "Island", "Preordain"])
+    everything = index.mask_of(index.names)
+    # First search: exactly the full search's candidates
+    assert list(_candidate_masks(index, {}, only_with=everything)) == list(_candidate_masks(index, {}))
+    # Delta: Oracle plus the new card plus any 3 others
+    oracle, new = index.bits[ORACLE], index.bits["Preordain"]
+    delta = list(_candidate_masks(index, {}, only_with=new))
+    assert len(delta) == comb(len(index) - 2, 3)
+    assert all(m & oracle and m & new for m in delta)
+
+def test_card_contributions_match_full_search(sample_deck, mocked_costs):
+    from doomsday_engine import card_contributions, pair_synergies
+    deck = sample_deck + ["Ponder", "Gush", "Island", "Mox Jet", "Gitaxian Probe"]
+    profiles = {"none": {}, "fluster": {"has_flusterstorm": True}}
+    with mocked_costs({"Gush": {"U": 2}, "Ponder": {"U": 1}}):
+        cards = card_contributions(deck, {}, profiles)
+        pairs = pair_synergies(deck, {}, profiles, top_k=3)
+        piles = suggest_viable_piles(deck, {}, profiles["fluster"], top_n=None)
+
+    row = cards[(cards.profile == "fluster") & (cards.card == "Ponder")].iloc[0]
+    assert row.piles == sum("Ponder" in p["pile"] for p in piles)
+    assert row.wins == sum("Ponder" in p["pile"] and p["outcome"] == "win" for p in piles)
+    assert set(cards.columns) >= {"win_rate", "marginal", "share_of_wins"}
+    assert len(pairs[pairs.profile == "none"]) == 3
+
+def test_contributions_reuse_a_precomputed_matrix(sample_deck, monkeypatch):
+    from doomsday_engine import analytics
+    deck = sample_deck + ["Ponder", "Gush", "Island", "Mox Jet"]
+    profiles = {"none": {}, "fluster": {"has_flusterstorm": True}}
+    matrix = analytics.outcome_matrix(deck, {}, profiles)
+    expected_cards = analytics.card_contributions(deck, {}, profiles)
+    expected_pairs = analytics.pair_synergies(deck, {}, profiles, top_k=3)
+
+    def no_search(*args, **kwargs):
+        raise AssertionError("searched again")
+
+    monkeypatch.setattr(analytics, "outcome_matrix", no_search)
+    cards = analytics.card_contributions(deck, {}, profiles, matrix=matrix)
+    pairs = analytics.pair_synergies(deck, {}, profiles, top_k=3, matrix=matrix)
+    assert cards.equals(expected_cards)
+    assert pairs.equals(expected_pairs)
+
+def test_parse_deck_sections_text_formats():
+    from doomsday_engine.parser import parse_deck_sections
+    text = """Deck
+4 Ponder (M12) 62
+1 Thassa’s Oracle (SLD) 1280 *F*
+1x Fire/Ice
+1 Brainstorm 28
+
+Sideboard (2)
+1 Flusterstorm (MH3) 123a
+SB: 1 Mindbreak Trap
+"""
+    sections = parse_deck_sections(text)
+    assert sections["main"] == {"Ponder": 4, ORACLE: 1, "Fire // Ice": 1, "Brainstorm": 1}
+    assert sections["sideboard"] == {"Flusterstorm": 1, "Mindbreak Trap": 1}
+
+def test_parse_deck_sections_mtgo_txt_blank_line_sideboard():
+    from doomsday_engine.parser import parse_deck_sections
+    assert parse_deck_sections("4 Ponder\n\n2 Flusterstorm") == {
+        "main": {"Ponder": 4}, "sideboard": {"Flusterstorm": 2}
+    }
+    # Only the last blank-separated block is the sideboard
+    grouped = parse_deck_sections("4 Ponder\n\n4 Dark Ritual\n1 Underground Sea\n\n2 Flusterstorm\n1 Ponder\n")
+    assert grouped["main"] == {"Ponder": 4, "Dark Ritual": 4, "Underground Sea": 1}
+    assert grouped["sideboard"] == {"Flusterstorm": 2, "Ponder": 1}
+    # With explicit headers, blank lines are just spacing
+    assert parse_deck_sections("Deck\n4 Ponder\n\n1 Brainstorm")["main"] == {"Ponder": 4, "Brainstorm": 1}
+
+def test_parse_deck_sections_blank_lines_before_sideboard_header():
+    from doomsday_engine.parser import parse_deck_sections
+    sections = parse_deck_sections(
+        "// Spells\n4 Ponder\n1 Thassa's Oracle\n\n"
+        "// Mana\n4 Dark Ritual\n1 Underground Sea\n\n"
+        "Sideboard\n1 Flusterstorm\n"
+    )
+    assert sections["main"] == {"Ponder": 4, ORACLE: 1, "Dark Ritual": 4, "Underground Sea": 1}
+    assert sections["sideboard"] == {"Flusterstorm": 1}
+
+def test_get_mana_cost_split_card_uses_front_face(monkeypatch):
+    from doomsday_engine import scryfall_cache
+    monkeypatch.setattr(scryfall_cache, "fetch_card_data", lambda name: {
+        "mana_cost": "{1}{R} // {1}{U}",
+        "card_faces": [{"mana_cost": "{1}{R}"}, {"mana_cost": "{1}{U}"}],
+    })
+    assert scryfall_cache.get_mana_cost("Fire // Ice") == {"C": 1, "R": 1}
+
+def test_parse_deck_counts_mtgo_dek(tmp_path):
+    from doomsday_engine.parser import iter_decklists
+    (tmp_path / "a.dek").write_text(
+        '<?xml version="1.0" encoding="utf-8"?><Deck>'
+        '<Cards CatID="1" Quantity="4" Sideboard="false" Name="Ponder" />'
+        '<Cards CatID="2" Quantity="1" Sideboard="false" Name="Thassa&apos;s Oracle" />'
+        '<Cards CatID="3" Quantity="2" Sideboard="true" Name="Flusterstorm" />'
+        '</Deck>', encoding="utf-8")
+    (tmp_path / "b.txt").write_text(SAMPLE_DECK_TEXT, encoding="utf-8")
+    decks = dict(iter_decklists(tmp_path))
+    assert decks[tmp_path / "a.dek"] == {"Ponder": 4, ORACLE: 1}
+    assert decks[tmp_path / "b.txt"]["Lotus Petal"] == 1
+
+def test_config_refresh_rebuilds_only_changes(tmp_path, monkeypatch, mocked_costs):
+    import json
+    import shutil
+    from doomsday_engine import config, suggester
+    from doomsday_engine.piles import CardIndex
+    registry = config.REGISTRY
+    fetched = []
+    monkeypatch.setattr(config, "get_mana_cost", lambda card: fetched.append(card) or {"U": 1})
+
+    cfg_path = tmp_path / "config.json"
+    shutil.copy(config.CONFIG_PATH, cfg_path)
+    decks = tmp_path / "decks"
+    decks.mkdir()
+    (decks / "a.txt").write_text(SAMPLE_DECK_TEXT, encoding="utf-8")
+    monkeypatch.setattr(registry, "config_path", cfg_path)
+    monkeypatch.setattr(registry, "decks_dir", decks)
+    with mocked_costs(dict(config.MANA_COSTS)):
+        try:
+            registry.refresh()
+            version = config.config_version()
+            assert registry.refresh() is False
+            assert config.config_version() == version
+
+            (decks / "b.txt").write_text("1 Some New Card\n1 Ponder\n", encoding="utf-8")
+            fetched.clear()
+            assert registry.refresh() is True
+            assert config.config_version() == version + 1
+            assert "Some New Card" in config.ALL_CARDS
+            assert "Some New Card" in fetched and "Brainstorm" not in fetched
+
+            (decks / "c.dek").write_text(
+                '<Deck><Cards Quantity="1" Sideboard="false" Name="Dek Only Card"/></Deck>',
+                encoding="utf-8"
+            )
+            assert registry.refresh() is True
+            assert "Dek Only Card" in config.ALL_CARDS
+
+            # A malformed deck is skipped, not fatal
+            (decks / "broken.dek").write_text("<Deck><Cards", encoding="utf-8")
+            assert registry.refresh() is True
+            assert "Dek Only Card" in config.ALL_CARDS
+
+            cfg = json.loads(cfg_path.read_text())
+            cfg["draw_spells"].append("Some New Card")
+            cfg_path.write_text(json.dumps(cfg))
+            fetched.clear()
+            published = config.tables()
+            assert registry.refresh() is True
+            assert "Some New Card" in config.DRAW_SPELLS
+            assert suggester._Categories(CardIndex(["Some New Card"])).draw
+            # A new snapshot is swapped in; the published one is never mutated
+            assert "Some New Card" not in published.draw_spells
+            assert published.mana_produce == config.MANA_PRODUCE
+            assert fetched == []
+        finally:
+            # Reload the real files (still with the stub cost source), then
+            # the context manager restores the original costs.
+            registry.config_path, registry.decks_dir = config.CONFIG_PATH, config.DECKS_DIR
+            registry.refresh()
+    assert "Some New Card" not in config.DRAW_SPELLS
+    assert "Some New Card" not in config.ALL_CARDS
+    assert "Some New Card" not in config.MANA_COSTS
+    assert "Lotus Petal" not in fetched
+
+def test_config_refresh_retries_costs_skipped_offline(tmp_path, monkeypatch, mocked_costs):
+    from doomsday_engine import config
+    from doomsday_engine.scryfall_cache import OFFLINE_ENV, offline
+    registry = config.REGISTRY
+
+    def lookup(card):
+        if offline():
+            raise LookupError(card)
+        return {"U": 1}
+
+    monkeypatch.setattr(config, "get_mana_cost", lookup)
+    decks = tmp_path / "decks"
+    decks.mkdir()
+    (decks / "a.txt").write_text("1 Uncached Card\n", encoding="utf-8")
+    monkeypatch.setattr(registry, "decks_dir", decks)
+    with mocked_costs({}):
+        try:
+            monkeypatch.setenv(OFFLINE_ENV, "1")
+            registry.refresh()
+            assert "Uncached Card" not in config.MANA_COSTS
+            assert registry.refresh() is False
+            monkeypatch.delenv(OFFLINE_ENV)
+            # Nothing changed on disk, but the skipped cost is looked up now
+            assert registry.refresh() is True
+            assert config.MANA_COSTS["Uncached Card"] == {"U": 1}
+            assert registry.refresh() is False
+        finally:
+            registry.decks_dir = config.DECKS_DIR
+            registry.refresh()
+
+def test_config_refresh_is_serialized():
+    import threading
+    from doomsday_engine import config
+    registry = config.REGISTRY
+    reloader = threading.Thread(target=registry.refresh)
+    with registry._lock:
+        reloader.start()
+        reloader.join(timeout=0.2)
+        assert reloader.is_alive()
+    reloader.join()
+
+def test_pile_details_keep_each_pool_key_order():
+    import pandas as pd
+    from doomsday_engine.details import _format_pools
+    pools = pd.Series([{"B": 3, "U": 0}, {"U": 1, "B": 2, "C": 0}, {}])
+    assert _format_pools(pools).tolist() == ["B:3, U:0", "U:1, B:2, C:0", ""]
+
+def test_suggest_table_matches_suggest_viable_piles(sample_deck):
+    from doomsday_engine import suggest_table
+    from doomsday_engine.results import display_frame, play_pattern_list
+    deck = sample_deck + ["Ponder", "Gush", "Island", "Mox Jet", "Time Walk"]
+    od = {"has_flusterstorm": True}
+    piles = suggest_viable_piles(deck, {}, od, top_n=None, debug=True)
+    table = suggest_table(deck, {}, od, top_n=None, debug=True)
+    assert len(table) == len(piles)
+    assert [play_pattern_list(p) for p in table["play_pattern"]] == [p["play_pattern"] for p in piles]
+    assert list(table["outcome"]) == [p["outcome"] for p in piles]
+    assert display_frame(table)["pile"].tolist() == [", ".join(p["pile"]) for p in piles]
+
+def test_generate_suggestions_respects_top_n():
+    from notebook_utils import generate_suggestions
+    deck_text = SAMPLE_DECK_TEXT + "1 Ponder\n1 Gush\n1 Island\n"
+    df = generate_suggestions(deck_text, {}, {}, initial_hand=None, top_n=2)
+    assert len(df) == 2
+    assert {"pile", "play_pattern", "turns_to_win", "outcome", "storm_count"} <= set(df.columns)